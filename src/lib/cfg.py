@@ -86,6 +86,7 @@ def default_config() -> ConfigParser:
         "major_changes_only": "False",
         "min_lines_changed": "3",
         "similarity_threshold": "0.7",
+        "max_file_size": "1048576",
     }
     config["tmux"] = {
         "enable": "True",
@@ -74,6 +74,13 @@ def check_file_system_config(config_path) -> bool:
         )
         is_valid = False
 
+    fs_max_file_size = cfg.getint("filesystem", "max_file_size", fallback=0)
+    if fs_max_file_size >= 0:
+        logger.debug(f"`max_file_size` is equal to {fs_max_file_size}")
+    else:
+        logger.error(f"`max_file_size` is negative (value is {fs_max_file_size})")
+        is_valid = False
+
     return is_valid
 
 
@@ -1,6 +1,13 @@
 """File system library."""
 
 import os
+from typing import TextIO
+
+# Buffer size used to write events in output files
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+# Bytes found in text files, see https://stackoverflow.com/a/7392391
+_TEXT_CHARS = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
 
 
 def is_binary(file_path: str, block_size: int = 4096) -> bool:
@@ -19,11 +26,8 @@ def is_binary(file_path: str, block_size: int = 4096) -> bool:
         `True` if binary else `False`
 
     """
-    # https://stackoverflow.com/a/7392391
-    textchars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
-
     with open(file_path, "rb") as f:
-        return bool(f.read(block_size).translate(None, textchars))
+        return bool(f.read(block_size).translate(None, _TEXT_CHARS))
 
 
 def get_md5(file_path: str, chunksize: int = 1024 * 1024) -> str:
@@ -99,6 +103,112 @@ def get_content(file_path: str) -> list[str] | None:
         return None
 
 
+def get_blake3_and_content(
+    file_path: str, block_size: int = 4096, mmap_size: int = 1024 * 1024
+) -> tuple[bytes, list[str] | None] | None:
+    """Generate blake3 digest and read text file as list of lines in a single read.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to hash and extract content.
+    block_size : int
+        Chunk to analyze to check if the file is binary
+    mmap_size : int
+        Size in bytes above which binary files are hashed from a memory map
+        instead of being read
+
+    Returns
+    -------
+    tuple[bytes, list[str] | None] | None
+        blake3 digest and content of the file, content is `None` if the file is binary.
+        Returns `None` if the file cannot be read.
+
+    """
+    from io import StringIO
+
+    from blake3 import blake3
+
+    try:
+        with open(file_path, "rb") as f:
+            is_binary = bool(f.read(block_size).translate(None, _TEXT_CHARS))
+            if is_binary and os.fstat(f.fileno()).st_size > mmap_size:
+                # Content is not needed: hash the pages in place with all cores
+                hasher = blake3(max_threads=blake3.AUTO)
+                hasher.update_mmap(file_path)
+                return hasher.digest(), None
+
+            f.seek(0)
+            data = f.read()
+    except OSError:
+        return None
+
+    # Raw digest: half the size of the hexadecimal one and compared with `memcmp`
+    file_hash = blake3(data).digest()
+    if is_binary:
+        return file_hash, None
+
+    # Same lines as `readlines` in text mode with universal newlines
+    return file_hash, StringIO(
+        data.decode("utf-8", errors="ignore"), newline=None
+    ).readlines()
+
+
+def convert_to_json_lines(file_path: str) -> None:
+    """Rewrite a JSON array of events as JSON Lines, other files are left untouched.
+
+    Logs written by previous versions are JSON arrays, appending JSON Lines to them
+    would make the whole file unreadable.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the events file
+
+    """
+    import json
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            if f.read(1) != "[":
+                return
+            f.seek(0)
+            try:
+                events = json.load(f)
+            except json.JSONDecodeError:
+                events = []
+    except OSError:
+        return
+
+    encoder = json.JSONEncoder(ensure_ascii=False)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.writelines(encoder.encode(event) + "\n" for event in events)
+
+
+def open_json_lines(file_path: str) -> TextIO:
+    """Open a JSON Lines events file to append events, creating its directory.
+
+    A JSON array written by previous versions is converted first.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the events file
+
+    Returns
+    -------
+    TextIO
+        File object to append events, flush it after each batch
+
+    """
+    output_dir = os.path.dirname(file_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    convert_to_json_lines(file_path)
+
+    return open(file_path, "a", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE)
+
+
 def find_file_in_dirs(file_path: str, dirs_path: list[str]) -> str | None:
     """Find which directory among `dirs_path` contains `file_path`.
 
@@ -3,11 +3,97 @@
 import json
 import logging
 import os
+import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from threading import Event
+from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
+# Number of context lines around changes in diffs
+DIFF_CONTEXT_LINES = 3
+
+# Maximum time in seconds before checking again a file changing on every check
+MAX_CHANGE_BACKOFF = 60
+
+# `json.dumps` builds a new encoder for each call when given non-default options
+_EVENT_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# TODO: need to generalize more filetypes
+# Filetypes where changed lines with a code keyword are major changes
+CODE_FILETYPES = frozenset({".py", ".js", ".ts", ".java", ".cpp", ".c", ".go", ".rs"})
+CODE_KEYWORDS = (
+    "def ",
+    "class ",
+    "function ",
+    "import ",
+    "from ",
+    "if ",
+    "for ",
+    "while ",
+    "return ",
+    "async ",
+    "await ",
+    "try ",
+    "except ",
+    "catch ",
+    "throw ",
+    "func ",
+    "fn ",
+    "match ",
+)
+
+# Keywords may appear anywhere in a line (e.g. `} catch (e) {`, `pub fn`),
+# a single case-insensitive search replaces `.lower()` and one scan per keyword
+_CODE_KEYWORDS_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in CODE_KEYWORDS), re.IGNORECASE
+)
+
+
+@dataclass(slots=True)
+class FileSnapshot:
+    """Last known state of a watched file.
+
+    Attributes
+    ----------
+    hash: blake3 digest of the content
+    size: Size in bytes
+    mtime_ns: Modification time in nanoseconds
+    lines: Content of the file, `None` if the file is binary
+    normalized: Normalized `lines` for major change detection, `None` if not computed
+    change_streak: Number of checks in a row where the content changed
+    next_check: `time.monotonic` time before which the file is not checked
+    """
+
+    hash: bytes
+    size: int
+    mtime_ns: int
+    lines: list[str] | None = None
+    normalized: list[str] | None = None
+    change_streak: int = 0
+    next_check: float = 0.0
+
+
+@dataclass(slots=True)
+class Change:
+    """Change detected in a watched file.
+
+    Attributes
+    ----------
+    type: Type of change, "new" or "modified"
+    file: Path to the file
+    display_path: Path shown in diffs and events, i.e. `<repo_name>/<rel_path>`
+    diff: Unified diff of the change, or a message for binary files
+    is_binary: The file is binary
+    """
+
+    type: str
+    file: str
+    display_path: str
+    diff: str
+    is_binary: bool = False
+
 
 @dataclass
 class FileSystemWatcher:
@@ -25,7 +111,9 @@ class FileSystemWatcher:
     major_changes_only: Filter out minor changes
     min_lines_changed: Minimum lines for major change
     similarity_threshold: Minimum similarity ratio [0.0-1.0] for major change detection
-    file_snapshots: Dictionary containing stats files to watch
+    max_file_size: Maximum size in bytes of watched files, 0 for no limit
+    file_snapshots: Dictionary containing the last known state of files to watch
+    output_stream: File object kept open to append events to `output_file`
     """
 
     enable: bool = True
@@ -38,8 +126,10 @@ class FileSystemWatcher:
     major_changes_only: bool = False
     min_lines_changed: int = 3
     similarity_threshold: float = 0.7
-    file_snapshots: dict[str, dict[str, str | list[str] | bool]] = field(
-        default_factory=dict
+    max_file_size: int = 1 << 20
+    file_snapshots: dict[str, FileSnapshot] = field(default_factory=dict)
+    output_stream: TextIO | None = field(
+        default=None, init=False, repr=False, compare=False
     )
 
 
@@ -66,6 +156,7 @@ def update_from_config(watcher: FileSystemWatcher, config_path: str) -> None:
         logger.warning("No directory specified to watch")
 
     watcher.output_file = os.path.expanduser(cfg["filesystem"]["output_file"])
+    close_output_file(watcher)
     watcher.tmux_output_file = os.path.expanduser(cfg["tmux"]["output_file"])
     watcher.summary_output_dir = os.path.expanduser(cfg["summarizer"]["output_dir"])
     watcher.include_filetypes = convert_to_set(
@@ -77,6 +168,9 @@ def update_from_config(watcher: FileSystemWatcher, config_path: str) -> None:
     watcher.major_changes_only = cfg.getboolean("filesystem", "major_changes_only")
     watcher.min_lines_changed = cfg.getint("filesystem", "min_lines_changed")
     watcher.similarity_threshold = cfg.getfloat("filesystem", "similarity_threshold")
+    watcher.max_file_size = cfg.getint(
+        "filesystem", "max_file_size", fallback=FileSystemWatcher.max_file_size
+    )
 
 
 def generate_diff(
@@ -101,21 +195,86 @@ def generate_diff(
         Diff between two versions
 
     """
-    from difflib import unified_diff
-
-    diff = list(
-        unified_diff(
-            old_lines,
-            new_lines,
-            fromfile=f"a/{file_name}",
-            tofile=f"b/{file_name}",
-            lineterm="",
+    from difflib import SequenceMatcher
+
+    if not old_lines:
+        # New file: every line is added, no need to match lines
+        if not new_lines:
+            return None
+        return "\n".join(
+            [
+                f"--- a/{file_name}",
+                f"+++ b/{file_name}",
+                f"@@ -0,0 +{_format_hunk_range(0, len(new_lines))} @@",
+                *("+" + line for line in new_lines),
+            ]
         )
-    )
+
+    # Lines shared at the start and at the end of both versions are not diffed,
+    # except the ones kept as context around the changes
+    num_lines = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < num_lines and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < num_lines - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]
+    ):
+        suffix += 1
+    start = max(prefix - DIFF_CONTEXT_LINES, 0)
+    end = max(suffix - DIFF_CONTEXT_LINES, 0)
+
+    # Same output as `difflib.unified_diff`, but without the "popular" lines
+    # heuristic that discards frequent lines such as `}` in source code
+    old_lines = old_lines[start : len(old_lines) - end]
+    new_lines = new_lines[start : len(new_lines) - end]
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    diff = []
+    for group in matcher.get_grouped_opcodes(DIFF_CONTEXT_LINES):
+        if not diff:
+            diff = [f"--- a/{file_name}", f"+++ b/{file_name}"]
+
+        # Hunk line numbers are relative to the trimmed lines
+        old_range = _format_hunk_range(start + group[0][1], start + group[-1][2])
+        new_range = _format_hunk_range(start + group[0][3], start + group[-1][4])
+        diff.append(f"@@ -{old_range} +{new_range} @@")
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                diff.extend(" " + line for line in old_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                diff.extend("-" + line for line in old_lines[i1:i2])
+            if tag in ("replace", "insert"):
+                diff.extend("+" + line for line in new_lines[j1:j2])
 
     return "\n".join(diff) if diff else None
 
 
+def _format_hunk_range(start: int, stop: int) -> str:
+    """Format the lines `start` to `stop` as a range of a unified diff hunk header.
+
+    Parameters
+    ----------
+    start : int
+        Index of the first line
+    stop : int
+        Index after the last line
+
+    Returns
+    -------
+    str
+        Range as `<first line>,<length>`, or `<first line>` for a single line
+
+    """
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    # An empty range refers to the line before it
+    return f"{start + 1 if length else start},{length}"
+
+
 def normalize_line(watcher: FileSystemWatcher, line: str) -> str:
     """Normalize line for major change detection (strip whitespace, ignore comments).
 
@@ -131,20 +290,31 @@ def normalize_line(watcher: FileSystemWatcher, line: str) -> str:
        Normalized `line`
 
     """
-    from re import sub
-
     if not watcher.major_changes_only:
         return line
 
+    return _normalize_line(line)
+
+
+# Lines repeat a lot within and across files (imports, blank lines, braces)
+@lru_cache(maxsize=1 << 16)
+def _normalize_line(line: str) -> str:
+    """Strip whitespace and ignore comments in `line`, see `normalize_line`."""
+    from sys import intern
+
     normalized = line.strip()
 
     # Skip empty lines and comments
-    if not normalized or normalized.startswith("#") or normalized.startswith("//"):
+    if not normalized or normalized.startswith(("#", "//")):
         return ""
 
-    # Normalize whitespace
-    normalized = sub(r"\s+", " ", normalized)
-    return normalized
+    # Normalize whitespace, every whitespace other than " " is not printable
+    if "  " in normalized or not normalized.isprintable():
+        # Same whitespaces as `\s` in `re`
+        normalized = " ".join(normalized.split())
+
+    # Equal normalized lines share one string, set operations then compare pointers
+    return intern(normalized)
 
 
 def is_major_change(
@@ -152,6 +322,8 @@ def is_major_change(
     old_lines: list[str],
     new_lines: list[str],
     file_path: str,
+    old_normalized: list[str] | None = None,
+    new_normalized: list[str] | None = None,
 ) -> bool:
     """Determine if changes are significant enough to capture.
 
@@ -169,6 +341,10 @@ def is_major_change(
         List of new lines after modification on the file
     file_path : str
         Path to the file to check
+    old_normalized : list[str] | None
+        `old_lines` already normalized with `normalize_line`, computed if `None`
+    new_normalized : list[str] | None
+        `new_lines` already normalized with `normalize_line`, computed if `None`
 
     Returns
     -------
@@ -181,156 +357,212 @@ def is_major_change(
     if not watcher.major_changes_only:
         return True
 
+    # Nothing to normalize if the content is the same
+    if old_lines == new_lines:
+        return False
+
     # Normalize lines to focus on structural changes
-    old_normalized = [normalize_line(watcher, line) for line in old_lines]
-    new_normalized = [normalize_line(watcher, line) for line in new_lines]
+    if old_normalized is None:
+        old_normalized = [normalize_line(watcher, line) for line in old_lines]
+    if new_normalized is None:
+        new_normalized = [normalize_line(watcher, line) for line in new_lines]
 
     # Remove empty lines after normalization
-    old_set = set(line for line in old_normalized if line)
-    new_set = set(line for line in new_normalized if line)
+    old_set = set(old_normalized)
+    old_set.discard("")
+    new_set = set(new_normalized)
+    new_set.discard("")
 
     # Calculate differences
-    added_lines = new_set - old_set
-    removed_lines = old_set - new_set
-    total_changes = len(added_lines) + len(removed_lines)
+    changed_lines = old_set ^ new_set
+
+    # Check minimum lines threshold first, it does not look at the lines
+    if len(changed_lines) >= watcher.min_lines_changed:
+        return True
 
     # Check for code keywords in changes
     ext = os.path.splitext(file_path)[1].lower()
 
-    # TODO: need to generalize more filetypes
-    if ext in [".py", ".js", ".ts", ".java", ".cpp", ".c", ".go", ".rs"]:
-        code_keywords = [
-            "def ",
-            "class ",
-            "function ",
-            "import ",
-            "from ",
-            "if ",
-            "for ",
-            "while ",
-            "return ",
-            "async ",
-            "await ",
-            "try ",
-            "except ",
-            "catch ",
-            "throw ",
-            "func ",
-            "fn ",
-            "match ",
-        ]
-        for line in added_lines.union(removed_lines):
-            if any(keyword in line.lower() for keyword in code_keywords):
+    if ext in CODE_FILETYPES:
+        for line in changed_lines:
+            if _CODE_KEYWORDS_RE.search(line):
                 return True
 
-    # Check minimum lines threshold
-    if total_changes >= watcher.min_lines_changed:
-        return True
-
-    # Check for significant content changes (not just typos)
-    for old_line, new_line in zip(old_normalized, new_normalized):
-        if old_line != new_line:
-            ratio = SequenceMatcher(None, old_line, new_line).ratio()
-            if ratio < watcher.similarity_threshold:
-                return True
+    # Check for significant content changes (not just typos) between replaced lines,
+    # lines are aligned first so an added or removed line does not shift the others
+    lines_matcher = SequenceMatcher(
+        None, old_normalized, new_normalized, autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in lines_matcher.get_opcodes():
+        if tag != "replace":
+            continue
+        for old_line, new_line in zip(old_normalized[i1:i2], new_normalized[j1:j2]):
+            if old_line != new_line:
+                matcher = SequenceMatcher(None, old_line, new_line)
+                # `real_quick_ratio` and `quick_ratio` are cheaper upper bounds of `ratio`
+                if (
+                    matcher.real_quick_ratio() < watcher.similarity_threshold
+                    or matcher.quick_ratio() < watcher.similarity_threshold
+                    or matcher.ratio() < watcher.similarity_threshold
+                ):
+                    return True
 
     return False
 
 
-def scan_files(watcher: FileSystemWatcher) -> list[str]:
+def scan_files(
+    watcher: FileSystemWatcher,
+) -> dict[str, tuple[str, os.stat_result]]:
     """Recursively scan all directories for files matching filetypes.
 
+    Each directory is scanned once with `os.scandir`, file types come from the
+    directory listing and each watched file is stat'ed once. Hidden files and
+    directories are skipped, and so are directories ending with an excluded filetype.
+
     Parameters
     ----------
     watcher : FileSystemWatcher
 
     Returns
     -------
-    list[str]
-        List of files to watch
+    dict[str, tuple[str, os.stat_result]]
+        Files to watch mapped to their display path, i.e. `<repo_name>/<rel_path>`,
+        and their stat
 
     """
     from datetime import date
-    from functools import partial
-    from glob import glob
     from time import time
 
     today = date.today().strftime("%Y-%m-%d")
 
-    def exclude_filetypes_fn(path: str, exclude_filetypes: set[str]):
-        return not any({path.endswith(filetype) for filetype in exclude_filetypes})
+    # `str.endswith` checks all filetypes at once
+    include_filetypes = tuple(watcher.include_filetypes)
+    exclude_filetypes = tuple(watcher.exclude_filetypes)
 
-    def glob_fn(
-        include_filetypes: set[str], exclude_filetypes: set[str], parent_dir: str
-    ):
-        result = []
-        for include_filetype in include_filetypes:
-            result_glob = glob(f"{parent_dir}/**/*{include_filetype}", recursive=True)
-            num_elements_found = len(result_glob)
-            if num_elements_found > 0:
-                logger.debug(
-                    f"Found {num_elements_found} {include_filetype} files in {parent_dir}"
-                )
-            else:
-                logger.debug(f"No {include_filetype} file in {parent_dir}")
-
-            result += result_glob
+    t_start = time()
 
-        if len(result) == 0:
-            if len(include_filetypes) > 0:
-                return []
+    # always exclude the output files to prevent infinite monitoring loops
+    abs_output_paths = {
+        os.path.abspath(watcher.output_file),
+        os.path.abspath(watcher.tmux_output_file),
+        os.path.abspath(os.path.join(watcher.summary_output_dir, f"{today}.md")),
+    }
+    # `os.path.abspath` is only needed for files named like an output file
+    output_names = {os.path.basename(p) for p in abs_output_paths}
 
-            logger.debug(f"Listing any files in {parent_dir}")
-            result = glob(f"{parent_dir}/**/*", recursive=True)
-            logger.debug(f"Found {len(result)} elements in {parent_dir}")
+    files_to_watch: dict[str, tuple[str, os.stat_result]] = {}
+    for watch_dir in watcher.dirs:
+        logger.debug(f"Searching for files in {watch_dir}")
+        num_files_found = len(files_to_watch)
 
-        logger.debug(f"Excluding filetypes in {parent_dir}")
-        result = filter(
-            partial(exclude_filetypes_fn, exclude_filetypes=exclude_filetypes),
-            result,
+        # Directories left to scan with their display path
+        dirs_to_scan = [(watch_dir, os.path.basename(os.path.normpath(watch_dir)))]
+        while dirs_to_scan:
+            dir_path, display_dir = dirs_to_scan.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            sub_dirs = []
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+
+                try:
+                    # Symbolic links are followed
+                    if entry.is_dir():
+                        if not name.endswith(exclude_filetypes):
+                            sub_dirs.append((entry.path, f"{display_dir}/{name}"))
+                        continue
+
+                    if (
+                        (include_filetypes and not name.endswith(include_filetypes))
+                        or name.endswith(exclude_filetypes)
+                        or not entry.is_file()
+                        or (
+                            name in output_names
+                            and os.path.abspath(entry.path) in abs_output_paths
+                        )
+                    ):
+                        continue
+
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                # Nested watched directories: the first one listed wins
+                files_to_watch.setdefault(entry.path, (f"{display_dir}/{name}", stat))
+
+            # Scan subdirectories in listing order, like `os.walk`
+            dirs_to_scan.extend(reversed(sub_dirs))
+
+        logger.debug(
+            f"Found {len(files_to_watch) - num_files_found} files in {watch_dir}"
         )
 
-        return result
+    logger.debug(f"Scanning took {time() - t_start}s")
 
-    t_start = time()
-    files_to_watch = []
-    for watch_dir in watcher.dirs:
-        logger.debug(f"Searching for files in {watch_dir}")
-        for p in glob_fn(
-            watcher.include_filetypes, watcher.exclude_filetypes, watch_dir
-        ):
-            # always exclude the output file to prevent infinite monitoring loops
-            abs_output_path = os.path.abspath(watcher.output_file)
-            abs_tmux_output_path = os.path.abspath(watcher.tmux_output_file)
-            abs_summary_output_dir = os.path.abspath(
-                os.path.join(watcher.summary_output_dir, f"{today}.md")
-            )
+    return files_to_watch
 
-            abs_p = os.path.abspath(p)
 
-            not_output_file = abs_p != abs_output_path
-            not_tmux_output_file = abs_p != abs_tmux_output_path
-            not_summary_output_dir = abs_p != abs_summary_output_dir
+def read_files(
+    file_paths: list[str],
+    stats: list[os.stat_result] | None = None,
+    max_workers: int | None = None,
+) -> list[tuple[bytes, list[str] | None] | None]:
+    """Hash and read files concurrently.
 
-            if (
-                not_output_file
-                and not_tmux_output_file
-                and not_summary_output_dir
-                and os.path.isfile(p)
-            ):
-                files_to_watch.append(p)
+    Reading and hashing release the GIL, so files are read in a thread pool
+    when there is more than one.
 
-    logger.debug(f"Scanning took {time() - t_start}s")
+    Parameters
+    ----------
+    file_paths : list[str]
+        Files to hash and read
+    stats : list[os.stat_result] | None
+        Stat of each file in `file_paths`, files are then read in inode order
+        which follows their order on disk more closely than the directory order
+    max_workers : int | None
+        Maximum number of threads, see `concurrent.futures.ThreadPoolExecutor`
 
-    return files_to_watch
+    Returns
+    -------
+    list[tuple[bytes, list[str] | None] | None]
+        Result of `lib.file.get_blake3_and_content` for each file, in the same order
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
+    from lib.file import get_blake3_and_content
 
-def check_for_changes(
-    watcher: FileSystemWatcher,
-) -> list[dict[str, str | list[str] | bool]]:
+    if len(file_paths) <= 1:
+        return [get_blake3_and_content(p) for p in file_paths]
+
+    read_order = range(len(file_paths))
+    if stats is not None:
+        read_order = sorted(
+            read_order, key=lambda i: (stats[i].st_dev, stats[i].st_ino)
+        )
+
+    contents: list[tuple[bytes, list[str] | None] | None] = [None] * len(file_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, content in zip(
+            read_order,
+            executor.map(get_blake3_and_content, (file_paths[i] for i in read_order)),
+        ):
+            contents[i] = content
+
+    return contents
+
+
+def check_for_changes(watcher: FileSystemWatcher) -> list[Change]:
     """Check all monitored files for changes and generate diffs.
 
     Handles both text and binary files appropriately.
+    Files changing on every check are checked less often, up to `MAX_CHANGE_BACKOFF`.
 
     Parameters
     ----------
@@ -338,182 +570,183 @@ def check_for_changes(
 
     Returns
     -------
-    list[dict[str, object]]
-        Returns list of changes with 'type', 'file', and 'diff' keys.
+    list[Change]
+        Returns list of changes.
 
     """
-    from lib.file import find_file_in_dirs, get_blake3, get_content, is_binary
+    from time import monotonic
 
     changes = []
     files = scan_files(watcher)
+    now = monotonic()
 
-    for filepath in files:
-        current_hash = get_blake3(filepath)
-        if current_hash is None:
+    candidates = []
+    for filepath, (display_path, stat) in files.items():
+        if watcher.max_file_size and stat.st_size > watcher.max_file_size:
             continue
 
-        # Find which directory this file belongs to
-        watch_dir = find_file_in_dirs(filepath, watcher.dirs)
-        if watch_dir is None:
+        snapshot = watcher.file_snapshots.get(filepath)
+        if snapshot is not None:
+            if now < snapshot.next_check:
+                continue
+
+            # Only read files whose size or modification time changed
+            if snapshot.size == stat.st_size and snapshot.mtime_ns == stat.st_mtime_ns:
+                snapshot.change_streak = 0
+                continue
+
+        candidates.append((filepath, display_path, stat, snapshot))
+
+    # Snapshots are only updated from this thread
+    contents = read_files(
+        [filepath for filepath, *_ in candidates],
+        [stat for _, _, stat, _ in candidates],
+    )
+    for (filepath, display_path, stat, snapshot), content in zip(candidates, contents):
+        if content is None:
+            continue
+        current_hash, current_lines = content
+
+        if snapshot is not None and snapshot.hash == current_hash:
+            # File touched without changing its content
+            snapshot.size = stat.st_size
+            snapshot.mtime_ns = stat.st_mtime_ns
+            snapshot.change_streak = 0
+            snapshot.next_check = 0.0
             continue
 
-        # Handle binary files
-        if is_binary(filepath):
-            rel_path = os.path.relpath(filepath, watch_dir)
-            repo_name = os.path.basename(watch_dir)
+        # Back off files changing on every check (e.g. logs) to avoid rereading them,
+        # starting from the second change in a row
+        change_streak = 0 if snapshot is None else snapshot.change_streak + 1
+        next_check = 0.0
+        if change_streak > 1:
+            backoff = min(2 ** (change_streak - 1), MAX_CHANGE_BACKOFF)
+            next_check = now + backoff
+            logger.debug(
+                f"{display_path} changed {change_streak} times in a row,"
+                f" next check in {backoff}s"
+            )
 
-            if filepath not in watcher.file_snapshots:
+        # Handle binary files
+        if current_lines is None:
+            if snapshot is None:
                 changes.append(
-                    {
-                        "type": "new",
-                        "file": filepath,
-                        "diff": f"Binary file added: {repo_name}/{rel_path}",
-                    }
+                    Change(
+                        "new",
+                        filepath,
+                        display_path,
+                        f"Binary file added: {display_path}",
+                        is_binary=True,
+                    )
                 )
-                watcher.file_snapshots[filepath] = {
-                    "hash": current_hash,
-                    "lines": [],
-                    "is_binary": True,
-                }
-            elif watcher.file_snapshots[filepath]["hash"] != current_hash:
+            else:
                 changes.append(
-                    {
-                        "type": "modified",
-                        "file": filepath,
-                        "diff": f"Binary file modified: {repo_name}/{rel_path}",
-                    }
+                    Change(
+                        "modified",
+                        filepath,
+                        display_path,
+                        f"Binary file modified: {display_path}",
+                        is_binary=True,
+                    )
                 )
-                watcher.file_snapshots[filepath] = {
-                    "hash": current_hash,
-                    "lines": [],
-                    "is_binary": True,
-                }
+            watcher.file_snapshots[filepath] = FileSnapshot(
+                current_hash,
+                stat.st_size,
+                stat.st_mtime_ns,
+                change_streak=change_streak,
+                next_check=next_check,
+            )
             continue
 
         # Handle text files
-        current_lines = get_content(filepath)
-        if current_lines is None:
-            continue
+        # Normalized once and kept in the snapshot for the next change
+        new_normalized = None
+        if watcher.major_changes_only:
+            new_normalized = [normalize_line(watcher, line) for line in current_lines]
 
-        rel_path = os.path.relpath(filepath, watch_dir)
-        repo_name = os.path.basename(watch_dir)
-
-        if filepath not in watcher.file_snapshots:
+        if snapshot is None:
             # New file
             if not watcher.major_changes_only or is_major_change(
-                watcher, [], current_lines, filepath
+                watcher, [], current_lines, filepath, [], new_normalized
             ):
-                diff = generate_diff([], current_lines, f"{repo_name}/{rel_path}")
+                diff = generate_diff([], current_lines, display_path)
                 if diff:
-                    changes.append({"type": "new", "file": filepath, "diff": diff})
-
-            watcher.file_snapshots[filepath] = {
-                "hash": current_hash,
-                "lines": current_lines,
-                "is_binary": False,
-            }
-        elif watcher.file_snapshots[filepath]["hash"] != current_hash:
-            # Changed file
-            watcher_lines = watcher.file_snapshots[filepath]["lines"]
-            if not isinstance(watcher_lines, list):
-                raise TypeError("`watcher_lines` is not a list")
-            old_lines = watcher_lines
-
-            if is_major_change(watcher, old_lines, current_lines, filepath):
-                diff = generate_diff(
-                    old_lines, current_lines, f"{repo_name}/{rel_path}"
-                )
+                    changes.append(Change("new", filepath, display_path, diff))
+        else:
+            # Changed file, a binary file has no previous lines
+            old_lines = snapshot.lines or []
+
+            if is_major_change(
+                watcher,
+                old_lines,
+                current_lines,
+                filepath,
+                snapshot.normalized,
+                new_normalized,
+            ):
+                diff = generate_diff(old_lines, current_lines, display_path)
                 if diff:
-                    changes.append({"type": "modified", "file": filepath, "diff": diff})
+                    changes.append(Change("modified", filepath, display_path, diff))
             else:
-                logger.debug(f"Minor change ignored in: {repo_name}/{rel_path}")
-
-            watcher.file_snapshots[filepath] = {
-                "hash": current_hash,
-                "lines": current_lines,
-                "is_binary": False,
-            }
+                logger.debug(f"Minor change ignored in: {display_path}")
+
+        watcher.file_snapshots[filepath] = FileSnapshot(
+            current_hash,
+            stat.st_size,
+            stat.st_mtime_ns,
+            current_lines,
+            new_normalized,
+            change_streak,
+            next_check,
+        )
 
     return changes
 
 
-def write_changes_to_file(
-    watcher: FileSystemWatcher, changes: list[dict[str, str | list[str] | bool]]
-) -> None:
-    """Write detected changes to output file with timestamps and formatting.
+def write_changes_to_file(watcher: FileSystemWatcher, changes: list[Change]) -> None:
+    """Append detected changes to output file with timestamps and formatting.
+
+    The output file follows the JSON Lines format: one event per line.
+    A JSON array written by previous versions is converted first.
 
     Parameters
     ----------
     watcher : FileSystemWatcher
-    changes : list[dict[str, str | list[str] | bool]]
+    changes : list[Change]
       List of changes to write in `watcher.output_file`
 
     """
     from datetime import datetime
 
-    from lib.file import find_file_in_dirs
+    from lib.file import open_json_lines
 
     if not changes:
         return
 
     timestamp = int(datetime.now().timestamp())
 
-    # Load existing JSON if the file exists
-    if os.path.exists(watcher.output_file):
-        with open(watcher.output_file, "r", encoding="utf-8") as f:
-            try:
-                all_events = json.load(f)
-            except json.JSONDecodeError:
-                all_events = []
-    else:
-        all_events = []
-
-    # Append new changes
-    changes_list = []
-    for change in changes:
-        change_file = change["file"]
-        if not isinstance(change_file, str):
-            raise TypeError("`change_file` is not `str`")
-
-        watch_dir = find_file_in_dirs(change_file, watcher.dirs)
-        if watch_dir:
-            rel_path = os.path.relpath(change_file, watch_dir)
-            repo_name = os.path.basename(os.path.normpath(watch_dir))
-            display_path = f"{repo_name}/{rel_path}"
-        else:
-            display_path = change["file"]
-
-        if not isinstance(change["type"], str):
-            raise TypeError("`change['type']` is not `str`.")
-
-        diff = change.get("diff", "")
-        if not isinstance(diff, str):
-            raise TypeError("`diff` is not a `str`.")
-
-        changes_list.append(
-            {
-                "file": display_path,
-                "status": change["type"].lower(),
-                "diff": diff.splitlines(),
-                "is_binary": change.get("is_binary", False),
-            }
-        )
-
-    all_events.append(
+    changes_list = [
         {
-            "event_type": "changes_detected",
-            "timestamp": timestamp,
-            "changes": changes_list,
+            "file": change.display_path,
+            "status": change.type.lower(),
+            "diff": change.diff.splitlines(),
+            "is_binary": change.is_binary,
         }
-    )
+        for change in changes
+    ]
+
+    event = {
+        "event_type": "changes_detected",
+        "timestamp": timestamp,
+        "changes": changes_list,
+    }
 
-    output_dir = os.path.dirname(watcher.output_file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    # Keep the file open across ticks and only append the new event
+    if watcher.output_stream is None:
+        watcher.output_stream = open_json_lines(watcher.output_file)
 
-    # Write updated JSON back to file
-    with open(watcher.output_file, "w", encoding="utf-8") as f:
-        json.dump(all_events, f, ensure_ascii=False, indent=2)
+    watcher.output_stream.write(_EVENT_ENCODER.encode(event) + "\n")
+    watcher.output_stream.flush()
 
     # Logging
     logger.debug(f"Captured {len(changes)} file changes to {watcher.output_file}")
@@ -521,9 +754,29 @@ def write_changes_to_file(
         logger.debug(f"{change['status']}: {change['file']}")
 
 
-def watch(watcher: FileSystemWatcher, stop_event: Event, timeout: int = 1) -> None:
+def close_output_file(watcher: FileSystemWatcher) -> None:
+    """Close the output file kept open by `write_changes_to_file`.
+
+    Parameters
+    ----------
+    watcher : FileSystemWatcher
+
+    """
+    if watcher.output_stream is not None:
+        watcher.output_stream.close()
+        watcher.output_stream = None
+
+
+def watch(
+    watcher: FileSystemWatcher,
+    stop_event: Event,
+    timeout: int = 1,
+    max_timeout: int = 4,
+) -> None:
     """Start monitoring loop. Runs until Ctrl+C is pressed.
 
+    The time between two scans is `timeout` after a file changes, then doubles up to `max_timeout` while files are idle.
+
     Parameters
     ----------
     watcher : FileSystemWatcher
@@ -532,12 +785,10 @@ def watch(watcher: FileSystemWatcher, stop_event: Event, timeout: int = 1) -> No
         Event sent to stop watching
     timeout : int
         Timeout in seconds in the while loop
+    max_timeout : int
+        Maximum timeout in seconds in the while loop when files are idle
 
     """
-    from time import sleep
-
-    from lib.file import get_blake3, get_content, is_binary
-
     logger.debug(f"Watching {len(watcher.dirs)} directories:")
     for watch_dir in watcher.dirs:
         logger.debug(watch_dir)
@@ -548,34 +799,41 @@ def watch(watcher: FileSystemWatcher, stop_event: Event, timeout: int = 1) -> No
         logger.debug(f"Excluding filetypes: {watcher.exclude_filetypes}")
 
     logger.debug("Initial scan...")
-    file_paths = scan_files(watcher)
-    for file_path in file_paths:
+    file_paths = []
+    stats = []
+    for file_path, (_, stat) in scan_files(watcher).items():
         logger.debug(f"Processing from initial scan {file_path}")
-        current_hash = get_blake3(file_path)
-        if is_binary(file_path):
-            watcher.file_snapshots[file_path] = {
-                "hash": current_hash,
-                "lines": [],
-                "is_binary": True,
-            }
-        else:
-            current_lines = get_content(file_path)
-            if current_lines is not None:
-                watcher.file_snapshots[file_path] = {
-                    "hash": current_hash,
-                    "lines": current_lines,
-                    "is_binary": False,
-                }
+        if watcher.max_file_size and stat.st_size > watcher.max_file_size:
+            logger.debug(f"Skipping {file_path}: larger than {watcher.max_file_size}B")
+            continue
+        file_paths.append(file_path)
+        stats.append(stat)
+
+    contents = read_files(file_paths, stats)
+    for file_path, stat, content in zip(file_paths, stats, contents):
+        if content is None:
+            continue
+        current_hash, current_lines = content
+        watcher.file_snapshots[file_path] = FileSnapshot(
+            current_hash, stat.st_size, stat.st_mtime_ns, current_lines
+        )
 
     logger.debug(f"Monitoring {len(watcher.file_snapshots)} files")
     for file_snapshot in watcher.file_snapshots:
         logger.debug(file_snapshot)
 
     logger.info("Watching for changes...")
-    while not stop_event.is_set():
-        changes = check_for_changes(watcher)
-        if changes:
-            logger.debug(f"Found {len(changes)} changes")
-            write_changes_to_file(watcher, changes)
-
-        sleep(timeout)
+    wait_s = timeout
+    try:
+        while not stop_event.is_set():
+            changes = check_for_changes(watcher)
+            if changes:
+                logger.debug(f"Found {len(changes)} changes")
+                write_changes_to_file(watcher, changes)
+                wait_s = timeout
+
+            stop_event.wait(wait_s)
+            if not changes:
+                wait_s = max(timeout, min(wait_s * 2, max_timeout))
+    finally:
+        close_output_file(watcher)
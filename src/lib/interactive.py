@@ -3,9 +3,12 @@
 import logging
 import os
 from configparser import ConfigParser
+from datetime import datetime
 
 import questionary
 
+from lib.check import command_exists
+
 logger = logging.getLogger(__name__)
 
 
@@ -189,9 +192,9 @@ def ask_and_update_llm_provider(cfg: ConfigParser) -> None:
     ).ask()
     logger.debug(f"API key for LLM provider: {api_key}")
 
-    cfg["llm"]["api_key"] = api_key
-    cfg["llm"]["model_name"] = model_name
-    cfg["llm"]["provider"] = provider
+    cfg["llm"].update(
+        {"api_key": api_key, "model_name": model_name, "provider": provider}
+    )
 
 
 def is_valid_hour(hour: str) -> bool:
@@ -208,8 +211,6 @@ def is_valid_hour(hour: str) -> bool:
         Returns `True` if format is correct, else `False`
 
     """
-    from datetime import datetime
-
     try:
         datetime.strptime(hour, "%H:%M")
         return True
@@ -244,8 +245,7 @@ def ask_and_update_summarizer(cfg: ConfigParser) -> None:
     ).ask()
     logger.debug(f"Summary hour: {summary_hour}")
 
-    cfg["summarizer"]["output_dir"] = summary_path
-    cfg["summarizer"]["at"] = summary_hour
+    cfg["summarizer"].update({"output_dir": summary_path, "at": summary_hour})
 
 
 def is_valid_formatter(formatter: str) -> bool:
@@ -263,8 +263,6 @@ def is_valid_formatter(formatter: str) -> bool:
         Note if equal to "None", we return `True`.
 
     """
-    from lib.check import command_exists
-
     if formatter == "None":
         return True
 
@@ -300,8 +298,7 @@ def ask_formatter(cfg: ConfigParser, formatters: list[str]) -> None:
         cfg["formatter"]["enable"] = "False"
     else:
         logger.debug(f"Chosen formatter: {formatter}")
-        cfg["formatter"]["enable"] = "True"
-        cfg["formatter"]["command"] = formatter
+        cfg["formatter"].update({"enable": "True", "command": formatter})
 
 
 def configure_interactively() -> None:
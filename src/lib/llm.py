@@ -2,8 +2,10 @@
 
 import json
 import os
+from functools import lru_cache
 
 
+@lru_cache(maxsize=16)
 def load_prompt(prompt_name: str) -> str:
     """
     Load a system prompt from the prompts directory.
@@ -61,7 +63,10 @@ def merge_logs_by_timestamp(tmux_log_path: str, fs_log_path: str) -> str:
 
     def read_json_log(path: str) -> list[LogEvent]:
         """
-        Read a JSON log file and return a list of events.
+        Read a JSON or JSON Lines log file and return a list of events.
+
+        Command outputs stored as one string are split into lines,
+        like in logs written by previous versions and in file diffs.
 
         Parameters
         ----------
@@ -76,11 +81,30 @@ def merge_logs_by_timestamp(tmux_log_path: str, fs_log_path: str) -> str:
         if not os.path.exists(path):
             return []
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        if content.lstrip().startswith("["):
+            try:
+                events = json.loads(content)
+            except json.JSONDecodeError:
+                return []
+        else:
+            events = []
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # NOTE: the last line may still be written by a watcher
+                    continue
+
+        for event in events:
+            if isinstance(event.get("output"), str):
+                event["output"] = event["output"].splitlines()
+
+        return events
 
     tmux_events: list[LogEvent] = read_json_log(tmux_log_path)
     fs_events: list[LogEvent] = read_json_log(fs_log_path)
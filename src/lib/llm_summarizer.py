@@ -3,13 +3,17 @@
 import logging
 import os
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, time
+from functools import lru_cache
 from threading import Event
 
 import litellm
 
 logger = logging.getLogger(__name__)
 
+# File in the output directory storing the day of the last scheduled summary
+LAST_RUN_FILE = ".last_run"
+
 
 @dataclass
 class LLMSummarizer:
@@ -90,7 +94,18 @@ def update_from_config(summarizer: LLMSummarizer, config_path: str) -> None:
     else:
         summarizer.formatter = None
 
+    last_run_path = os.path.join(summarizer.output_dir, LAST_RUN_FILE)
+    if os.path.exists(last_run_path):
+        with open(last_run_path, "r", encoding="utf-8") as f:
+            last_run = f.read().strip()
+        try:
+            summarizer.last_run_day = datetime.strptime(last_run, "%Y-%m-%d").date()
+            logger.debug(f"Last summary was generated on {last_run}")
+        except ValueError:
+            logger.warning(f"Cannot parse last run day {last_run} in {last_run_path}")
+
 
+@lru_cache(maxsize=8)
 def get_extra_headers(provider: str) -> dict[object, object]:
     """Return `extra_headers` value for litellm `completion` function.
 
@@ -102,7 +117,8 @@ def get_extra_headers(provider: str) -> dict[object, object]:
     Returns
     -------
     dict
-        Dictionary to be passed as argument to litellm `completion` function
+        Dictionary to be passed as argument to litellm `completion` function.
+        The result is cached so it must not be mutated, pass a copy instead.
 
     """
     if provider == "github_copilot":
@@ -146,7 +162,8 @@ def summarize_one(summarizer: LLMSummarizer, text: str, prompt: str) -> str | No
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
             ],
-            extra_headers=get_extra_headers(summarizer.provider),
+            # litellm may update the headers in place
+            extra_headers=dict(get_extra_headers(summarizer.provider)),
         )
         if isinstance(response, ModelResponse):
             return response["choices"][0]["message"]["content"]
@@ -177,7 +194,8 @@ def summarize_many(summarizer: LLMSummarizer, list_text: list[str]) -> str | Non
     summary = summarize_one(summarizer, list_text[0], prompt="single")
     num_chunks = len(list_text)
     for idx, text in enumerate(list_text[1:]):
-        logger.debug(f"Summarizing chunk {idx + 1}/{num_chunks}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Summarizing chunk {idx + 1}/{num_chunks}")
         if summary is None:
             logger.error("Failed to summarize one of the chunks.")
             return None
@@ -239,10 +257,38 @@ def format_summary(summarizer: LLMSummarizer, summary_path: str):
         )
 
 
+def seconds_until_run_hour(run_hour: time, now: datetime) -> float:
+    """Compute the time to wait until the next `run_hour`.
+
+    Both datetimes are converted to timestamps in the local timezone so the
+    result stays right when a DST transition happens in between.
+
+    Parameters
+    ----------
+    run_hour : time
+        Hour at which the summary is generated
+    now : datetime
+        Current naive local datetime
+
+    Returns
+    -------
+    float
+        Number of seconds until the next `run_hour`
+
+    """
+    from datetime import timedelta
+
+    next_run_day = now.date()
+    if now.time() >= run_hour:
+        next_run_day += timedelta(days=1)
+    next_run = datetime.combine(next_run_day, run_hour)
+    return max(0.0, next_run.timestamp() - now.timestamp())
+
+
 def generate_summary(
     summarizer: LLMSummarizer,
     stop_event: Event,
-    timeout: int = 1,
+    timeout: float | None = None,
     wait_to_summarize: bool = True,
 ) -> None:
     """
@@ -254,20 +300,19 @@ def generate_summary(
         The summarizer instance.
     stop_event : Event
         Event sent to stop watching
-    timeout : int
-        Timeout in seconds in the while loop
+    timeout : float | None
+        Maximum time in seconds to wait between two checks of the wall clock.
+        If `None`, we sleep until the next `run_hour` and only wake up once a day,
+        `stop_event` still interrupts the wait.
+        The wait runs on the monotonic clock: a suspend or a clock change during it
+        delays the summary, setting `timeout` bounds this delay at the cost of more wake-ups.
     wait_to_summarize : bool
         If `True` we wait for the `stop_event` to be set to summarize.
         Else we summarize directly.
     """
-    from datetime import date
-    from time import sleep
-
     from lib.llm import merge_logs_by_timestamp
 
-    today = date.today().strftime("%Y-%m-%d")
-    if not os.path.exists(summarizer.output_dir):
-        os.makedirs(summarizer.output_dir, exist_ok=True)
+    os.makedirs(summarizer.output_dir, exist_ok=True)
 
     while not stop_event.is_set() or not wait_to_summarize:
         now = datetime.now()
@@ -281,8 +326,10 @@ def generate_summary(
                 f"Reading logs: {summarizer.tmux_log_path}, {summarizer.fs_log_path}"
             )
 
-            today = date.today().strftime("%Y-%m-%d")
-            output_file = os.path.join(summarizer.output_dir, f"{today}.md")
+            # NOTE: `now` is reused so the report name matches `last_run_day`
+            output_file = os.path.join(
+                summarizer.output_dir, f"{now.strftime('%Y-%m-%d')}.md"
+            )
 
             logger.debug(
                 f"Merge {summarizer.tmux_log_path} and {summarizer.fs_log_path}"
@@ -306,17 +353,28 @@ def generate_summary(
 
             format_summary(summarizer, output_file)
 
-            summarizer.last_run_day = now.date()
+            # A manual summary must not skip the scheduled one of the same day
+            if wait_to_summarize:
+                summarizer.last_run_day = now.date()
+                last_run_path = os.path.join(summarizer.output_dir, LAST_RUN_FILE)
+                with open(last_run_path, "w", encoding="utf-8") as f:
+                    f.write(summarizer.last_run_day.strftime("%Y-%m-%d"))
 
-            with open(summarizer.fs_log_path, "w") as f:
-                logger.debug(f"Emptying {summarizer.fs_log_path}")
-            with open(summarizer.tmux_log_path, "w") as f:
-                logger.debug(f"Emptying {summarizer.tmux_log_path}")
+            for log_path in (summarizer.fs_log_path, summarizer.tmux_log_path):
+                if os.path.exists(log_path):
+                    os.truncate(log_path, 0)
+                    logger.debug(f"Emptied {log_path}")
 
             if not wait_to_summarize:
                 break
 
-        sleep(timeout)
+        # Sleep until the next run hour or at most `timeout`
+        wait_s = seconds_until_run_hour(summarizer.run_hour, datetime.now())
+        if timeout is not None:
+            wait_s = min(wait_s, timeout)
+
+        if stop_event.wait(wait_s):
+            break
 
 
 def multiply_prompt(
@@ -3,15 +3,65 @@
 import re
 import subprocess
 
+# Bash-like prompt followed by a command
+_BASH_COMMAND_RE = re.compile(r"^[^$]*\$\s*(.+)$")
 
-def get_tmux_pane_content(pane: str) -> str | None:
+# Arrow-like prompt markers, tried in this order
+_PROMPT_MARKERS = ("❯", "➜", "→", "»", "⟩")
+
+# Commands too basic to be worth reporting
+_BASIC_COMMANDS = frozenset({"ls", "cd", "pwd", "echo", "cat", "clear", "history"})
+
+
+def _capture_pane(pane: str, scrollback: int) -> str:
+    """
+    Run `tmux capture-pane` on `pane` including `scrollback` lines of history.
+
+    Parameters
+    ----------
+    pane : str
+        The target tmux pane identifier (e.g., 'session:window.pane').
+    scrollback : int
+        Number of history lines to capture above the visible pane.
+
+    Returns
+    -------
+    str
+        The content of the pane.
+    """
+    result = subprocess.run(
+        ["tmux", "capture-pane", "-t", pane, "-S", f"-{scrollback}", "-p"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 0 and result.stdout.strip():
+        return result.stdout
+
+    result = subprocess.run(
+        ["tmux", "capture-pane", "-t", pane, "-p"],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def get_tmux_pane_content(
+    pane: str, scrollback: int = 50, max_scrollback: int = 1000
+) -> str | None:
     """
     Capture and return the content of a specific tmux pane.
 
+    Only the last `scrollback` lines of history are captured first.
+    If the last command cannot be found in them, the pane is captured again with `max_scrollback` lines.
+
     Parameters
     ----------
     pane : str
         The target tmux pane identifier (e.g., 'session:window.pane').
+    scrollback : int
+        Number of history lines to capture first.
+    max_scrollback : int
+        Number of history lines to capture if `scrollback` is not enough.
 
     Returns
     -------
@@ -19,24 +69,93 @@ def get_tmux_pane_content(pane: str) -> str | None:
         The content of the pane, or None if capture fails.
     """
     try:
-        result = subprocess.run(
-            ["tmux", "capture-pane", "-t", pane, "-S", "-1000", "-p"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout
-
-        result = subprocess.run(
-            ["tmux", "capture-pane", "-t", pane, "-p"],
-            capture_output=True,
-            text=True,
-        )
-        return result.stdout
+        content = _capture_pane(pane, scrollback)
+        if scrollback >= max_scrollback or not _needs_more_scrollback(content):
+            return content
+
+        return _capture_pane(pane, max_scrollback)
     except subprocess.CalledProcessError:
         return None
 
 
+def get_tmux_panes_content(
+    panes: list[str], scrollback: int = 50, max_scrollback: int = 1000
+) -> dict[str, str | None]:
+    """
+    Capture and return the content of several tmux panes with a single `tmux` call.
+
+    Captures are chained with `;` and delimited by a random separator printed with `display-message`.
+    If this call fails (e.g. a pane has been closed meanwhile), each pane is captured on its own in parallel.
+
+    Parameters
+    ----------
+    panes : list[str]
+        The target tmux pane identifiers (e.g., 'session:window.pane').
+    scrollback : int
+        Number of history lines to capture first.
+    max_scrollback : int
+        Number of history lines to capture if `scrollback` is not enough.
+
+    Returns
+    -------
+    dict[str, str | None]
+        The content of each pane, or None if capture fails.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from uuid import uuid4
+
+    if not panes:
+        return {}
+
+    separator = uuid4().hex
+    cmd = ["tmux"]
+    for pane in panes:
+        if len(cmd) > 1:
+            cmd.append(";")
+        cmd += ["capture-pane", "-t", pane, "-S", f"-{scrollback}", "-p", ";"]
+        cmd += ["display-message", "-p", separator]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    contents = result.stdout.split(f"{separator}\n")
+    if result.returncode != 0 or len(contents) != len(panes) + 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(panes))) as executor:
+            contents = executor.map(
+                lambda pane: get_tmux_pane_content(pane, scrollback, max_scrollback),
+                panes,
+            )
+            return dict(zip(panes, contents))
+
+    # Same checks as `get_tmux_pane_content` on each capture
+    panes_content: dict[str, str | None] = {}
+    for pane, content in zip(panes, contents):
+        if not content.strip():
+            content = _capture_pane(pane, scrollback)
+        if scrollback < max_scrollback and _needs_more_scrollback(content):
+            content = _capture_pane(pane, max_scrollback)
+        panes_content[pane] = content
+
+    return panes_content
+
+
+def _needs_more_scrollback(pane_content: str) -> bool:
+    """
+    Check if the last command of a finished pane is missing from `pane_content`.
+
+    Parameters
+    ----------
+    pane_content : str
+        The text content of the tmux pane.
+
+    Returns
+    -------
+    bool
+        True if the pane should be captured with more history, False otherwise.
+    """
+    return is_command_finished(pane_content) and not get_command_from_content(
+        pane_content
+    )
+
+
 def get_command_from_content(pane_content: str) -> str:
     """
     Extract the most recently executed command from pane content.
@@ -65,19 +184,17 @@ def get_command_from_content(pane_content: str) -> str:
         if not line:
             continue
 
-        bash_match = re.match(r"^[^$]*\$\s*(.+)$", line)
+        bash_match = _BASH_COMMAND_RE.match(line)
         if bash_match:
             cmd = bash_match.group(1).strip()
             if is_valid_command(cmd):
                 return cmd
 
-        for char in ["❯", "➜", "→", "»", "⟩"]:
-            if char in line:
-                parts = line.split(char, 1)
-                if len(parts) > 1 and parts[1].strip():
-                    cmd = parts[1].strip()
-                    if is_valid_command(cmd):
-                        return cmd
+        for marker in _PROMPT_MARKERS:
+            if marker in line:
+                cmd = line.split(marker, 1)[1].strip()
+                if is_valid_command(cmd):
+                    return cmd
 
         # TODO: to remove https://github.com/frx-org/yves/pull/19#discussion_r2310915036
         if line.startswith(">>> ") and len(line) > 4:
@@ -168,13 +285,11 @@ def is_valid_command(cmd: str, max_length: int = 10) -> bool:
     if not cmd:
         return False
 
-    if len(cmd.split()) > max_length:
+    words = cmd.split()
+    if not words or len(words) > max_length:
         return False
 
-    basic_commands = ["ls", "cd", "pwd", "echo", "cat", "clear", "history"]
-    base_cmd = cmd.split()[0]
-
-    return base_cmd not in basic_commands
+    return words[0] not in _BASIC_COMMANDS
 
 
 def is_command_finished(pane_content: str) -> bool:
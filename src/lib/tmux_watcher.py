@@ -5,11 +5,31 @@ import logging
 import os
 import subprocess
 from dataclasses import dataclass, field
-from datetime import datetime
-from threading import Event
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import time
+from typing import TextIO
+
+from blake3 import blake3
+
+from lib.cfg import convert_to_list, parse_config
+from lib.file import open_json_lines
+from lib.threading import make_runner
+from lib.tmux import (
+    extract_last_command_output,
+    get_command_from_content,
+    get_tmux_panes_content,
+    is_command_finished,
+)
 
 logger = logging.getLogger(__name__)
 
+# List all panes of all sessions as `session:window.pane`
+_LIST_PANES_CMD = ("tmux", "list-panes", "-a", "-F", "#S:#I.#P")
+
+# `json.dumps` builds a new encoder for each call when given non-default options
+_EVENT_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
 
 @dataclass
 class TmuxWatcher:
@@ -22,6 +42,7 @@ class TmuxWatcher:
     output_file: Output file for command outputs
     capture_full_output: If True, capture full pane content instead of just last command
     pane_states: Dictionary to hold the state of each tmux pane
+    output_stream: File object kept open to append events to `output_file`
     """
 
     enable: bool = True
@@ -29,6 +50,9 @@ class TmuxWatcher:
     output_file: str = "changes.json"
     capture_full_output: bool = False
     pane_states: dict[str, dict[str, object]] = field(default_factory=dict)
+    output_stream: TextIO | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 def update_from_config(watcher: TmuxWatcher, config_path: str) -> None:
@@ -42,17 +66,18 @@ def update_from_config(watcher: TmuxWatcher, config_path: str) -> None:
         Path to the configuration file
 
     """
-    from lib.cfg import convert_to_list, parse_config
-
     cfg = parse_config(config_path)
 
     watcher.enable = cfg.getboolean("tmux", "enable")
     watcher.panes = convert_to_list(cfg.get("tmux", "panes"))
     watcher.output_file = os.path.expanduser(cfg["tmux"]["output_file"])
+    close_output_file(watcher)
     watcher.capture_full_output = cfg.getboolean("tmux", "capture_full_output")  # type: ignore
 
 
-def check_for_completed_commands(watcher: TmuxWatcher) -> list[dict[str, object]]:
+def check_for_completed_commands(
+    watcher: TmuxWatcher, stop_event: Event | None = None
+) -> list[dict[str, object]]:
     """
     Check all monitored panes for newly completed commands.
 
@@ -60,23 +85,25 @@ def check_for_completed_commands(watcher: TmuxWatcher) -> list[dict[str, object]
     ----------
     watcher : TmuxWatcher
         The watcher instance containing pane states and configuration.
+    stop_event : Event | None, optional
+        Event sent to stop watching, remaining panes are skipped once it is set.
 
     Returns
     -------
     list of dict
         List of completed commands with pane, command, output, and timestamp.
     """
-    from lib.tmux import (
-        extract_last_command_output,
-        get_command_from_content,
-        get_tmux_pane_content,
-        is_command_finished,
-    )
-
     completed_commands = []
 
-    for pane in watcher.panes:
-        current_content = get_tmux_pane_content(pane)
+    if watcher.capture_full_output:
+        panes_content = get_tmux_panes_content(watcher.panes, scrollback=1000)
+    else:
+        panes_content = get_tmux_panes_content(watcher.panes)
+
+    for pane, current_content in panes_content.items():
+        if stop_event is not None and stop_event.is_set():
+            break
+
         if current_content is None:
             continue
 
@@ -84,10 +111,17 @@ def check_for_completed_commands(watcher: TmuxWatcher) -> list[dict[str, object]
             watcher.pane_states[pane] = {
                 "last_command": "",
                 "waiting_for_completion": False,
+                "content_hash": b"",
             }
 
         pane_state = watcher.pane_states[pane]
 
+        # Nothing to parse if the pane did not change since last check
+        content_hash = blake3(current_content.encode()).digest()
+        if content_hash == pane_state["content_hash"]:
+            continue
+        pane_state["content_hash"] = content_hash
+
         if is_command_finished(current_content):
             command = get_command_from_content(current_content)
 
@@ -103,7 +137,7 @@ def check_for_completed_commands(watcher: TmuxWatcher) -> list[dict[str, object]
                             "pane": pane,
                             "command": command,
                             "output": output,
-                            "timestamp": datetime.now(),
+                            "timestamp": int(time()),
                         }
                     )
 
@@ -117,7 +151,10 @@ def write_commands_to_file(
     watcher: TmuxWatcher, completed_commands: list[dict[str, object]]
 ) -> None:
     """
-    Write completed commands and their outputs to the output file.
+    Append completed commands and their outputs to the output file.
+
+    The output file follows the JSON Lines format: one event per line.
+    A JSON array written by previous versions is converted first.
 
     Parameters
     ----------
@@ -129,74 +166,105 @@ def write_commands_to_file(
     if not completed_commands:
         return
 
-    # Load existing JSON if the file exists
-    if os.path.exists(watcher.output_file):
-        with open(watcher.output_file, "r", encoding="utf-8") as f:
-            try:
-                all_events = json.load(f)
-            except json.JSONDecodeError:
-                all_events = []
-    else:
-        all_events = []
-
-    # Append new completed commands
+    new_events = []
     for cmd in completed_commands:
-        timestamp = cmd["timestamp"]
-        if not isinstance(timestamp, datetime):
-            raise TypeError("`timestamp` is not `datetime`")
-
         output = cmd["output"]
         if not isinstance(output, str):
             raise TypeError("`output` is not `str`")
 
-        timestamp_str = int(timestamp.timestamp())
-        all_events.append(
+        new_events.append(
             {
                 "event_type": "command_completed",
-                "timestamp": timestamp_str,
+                "timestamp": cmd["timestamp"],
                 "pane": cmd["pane"],
                 "command": cmd["command"],
-                # Split output into lines for easier processing later
-                "output": output.splitlines(),
+                "output": output,
             }
         )
 
-    output_dir = os.path.dirname(watcher.output_file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    # Keep the file open across batches and only append new events
+    if watcher.output_stream is None:
+        watcher.output_stream = open_json_lines(watcher.output_file)
 
-    # Write updated JSON back to file
-    with open(watcher.output_file, "w", encoding="utf-8") as f:
-        json.dump(all_events, f, ensure_ascii=False, indent=2)
+    watcher.output_stream.writelines(
+        _EVENT_ENCODER.encode(event) + "\n" for event in new_events
+    )
+    watcher.output_stream.flush()
 
     logger.debug(f"Captured {len(completed_commands)} completed commands")
     for cmd in completed_commands:
         logger.debug(f"[{cmd['pane']}] {cmd['command']}")
 
 
-def get_active_tmux_panes(watcher: TmuxWatcher, timeout: int):
-    """Continuously monitor and update the list of all active tmux pane indices. Prints added and removed panes, including when all panes are closed.
+def close_output_file(watcher: TmuxWatcher) -> None:
+    """
+    Close the output file kept open by `write_commands_to_file`.
 
     Parameters
     ----------
     watcher : TmuxWatcher
-        The watcher instance to update.
-    timeout : int
-        The timeout duration for checking active panes.
+        The watcher instance holding the output file.
+    """
+    if watcher.output_stream is not None:
+        watcher.output_stream.close()
+        watcher.output_stream = None
+
+
+def write_commands_from_queue(
+    watcher: TmuxWatcher,
+    commands_queue: Queue[list[dict[str, object]] | None],
+    stop_event: Event,
+) -> None:
+    """
+    Write batches of completed commands received from `commands_queue` until `None` is received.
+
+    All batches already waiting in the queue are merged and written at once.
+
+    Parameters
+    ----------
+    watcher : TmuxWatcher
+        The watcher instance with the output file path.
+    commands_queue : Queue[list[dict[str, object]] | None]
+        Queue of completed commands batches, `None` stops the writer.
+    stop_event : Event
+        Unused, it is required by `make_runner` which gives it to every target.
+        The writer stops on `None` instead, once every queued command is written.
     """
-    from time import sleep
+    stop = False
+    while not stop:
+        batch = commands_queue.get()
+        completed_commands = []
+        while True:
+            if batch is None:
+                stop = True
+            else:
+                completed_commands += batch
+
+            try:
+                batch = commands_queue.get_nowait()
+            except Empty:
+                break
+
+        write_commands_to_file(watcher, completed_commands)
+
 
+def get_active_tmux_panes(watcher: TmuxWatcher) -> None:
+    """Update the list of all active tmux pane indices. Prints added and removed panes, including when all panes are closed.
+
+    It only lists panes once, `watch` is in charge of calling it again.
+
+    Parameters
+    ----------
+    watcher : TmuxWatcher
+        The watcher instance to update.
+    """
     previous_panes = set(watcher.panes)
     try:
-        result = subprocess.run(
-            ["tmux", "list-panes", "-a", "-F", "#S:#I.#P"],
-            capture_output=True,
-            text=True,
-        )
-        if result is None:
-            current_panes = set()
-        elif result.returncode == 0:
-            current_panes = set(result.stdout.strip().splitlines())
+        result = subprocess.run(_LIST_PANES_CMD, capture_output=True)
+        if result.returncode == 0:
+            current_panes = set(
+                result.stdout.decode("utf-8", "replace").strip().splitlines()
+            )
         else:
             current_panes = set()
     except Exception as e:
@@ -210,21 +278,20 @@ def get_active_tmux_panes(watcher: TmuxWatcher, timeout: int):
         logger.debug(f"Panes closed: {removed}")
     watcher.panes = list(current_panes)
     if len(watcher.panes) == 0:
-        logger.warning("No active tmux panes detected.")
-        result = None
-        while result is None or result.returncode != 0:
-            result = subprocess.run(
-                ["tmux", "list-panes", "-a", "-F", "#S:#I.#P"],
-                capture_output=True,
-                text=True,
-            )
-            sleep(timeout)
+        if removed:
+            logger.warning("No active tmux panes detected.")
+        else:
+            logger.debug("No active tmux panes detected.")
 
 
-def watch(watcher: TmuxWatcher, stop_event: Event, timeout: int = 1) -> None:
+def watch(
+    watcher: TmuxWatcher, stop_event: Event, timeout: int = 1, max_timeout: int = 8
+) -> None:
     """
     Start the main watching loop to monitor panes continuously.
 
+    The time between two checks is `timeout` after a pane changes, then doubles up to `max_timeout` while panes are idle.
+
     Parameters
     ----------
     watcher : TmuxWatcher
@@ -233,9 +300,9 @@ def watch(watcher: TmuxWatcher, stop_event: Event, timeout: int = 1) -> None:
         Event sent to stop watching
     timeout : int, optional
         Timeout in seconds between checks (default is 1).
+    max_timeout : int, optional
+        Maximum timeout in seconds between checks when panes are idle (default is 8).
     """
-    from time import sleep
-
     logger.info("Start watching...")
     initial_panes = watcher.panes.copy()
     if initial_panes:
@@ -247,10 +314,47 @@ def watch(watcher: TmuxWatcher, stop_event: Event, timeout: int = 1) -> None:
         f"Capture mode: {'Full output' if watcher.capture_full_output else 'Last command only'}"
     )
 
-    while not stop_event.is_set():
-        if not initial_panes:
-            get_active_tmux_panes(watcher, timeout)
-        completed_commands = check_for_completed_commands(watcher)
-        if completed_commands:
-            write_commands_to_file(watcher, completed_commands)
-        sleep(timeout)
+    # Write to the output file in another thread to keep capturing panes
+    commands_queue: Queue[list[dict[str, object]] | None] = Queue()
+    writer_exceptions: list[BaseException] = []
+    writer = Thread(
+        target=make_runner(
+            write_commands_from_queue,
+            watcher,
+            commands_queue,
+            stop_event=stop_event,
+            exceptions=writer_exceptions,
+        )
+    )
+    writer.start()
+
+    wait_s = timeout
+    try:
+        while not stop_event.is_set():
+            if not initial_panes:
+                get_active_tmux_panes(watcher)
+            previous_hashes = {
+                pane: state["content_hash"]
+                for pane, state in watcher.pane_states.items()
+            }
+            completed_commands = check_for_completed_commands(watcher, stop_event)
+            if completed_commands:
+                commands_queue.put(completed_commands)
+
+            # Keep checking often while something is running in a pane
+            changed = completed_commands or any(
+                previous_hashes.get(pane) != state["content_hash"]
+                for pane, state in watcher.pane_states.items()
+            )
+            if changed:
+                wait_s = timeout
+            stop_event.wait(wait_s)
+            if not changed:
+                wait_s = max(timeout, min(wait_s * 2, max_timeout))
+    finally:
+        commands_queue.put(None)
+        writer.join()
+        close_output_file(watcher)
+
+    if writer_exceptions:
+        raise writer_exceptions[0]
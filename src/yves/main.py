@@ -3,149 +3,235 @@
 import argparse
 import logging
 import os
+from typing import TYPE_CHECKING
 
-from lib.llm_summarizer import LLMSummarizer, generate_summary
-from lib.llm_summarizer import update_from_config as llm_update_from_config
+if TYPE_CHECKING:
+    from lib.llm_summarizer import LLMSummarizer
 
+logger = logging.getLogger(__name__)
 
-def main():
-    """Execute main function."""
-    global_parser = argparse.ArgumentParser(add_help=False)
-    global_parser.add_argument(
-        "--config",
-        "-c",
-        type=str,
-        default="~/.config/yves/config",
-        help="Path to configuration file",
-    )
-    global_parser.add_argument("--debug", action="store_true", help="Debug logging")
 
-    parser = argparse.ArgumentParser()
-    sub_parsers = parser.add_subparsers(dest="command")
-    sub_parsers.add_parser("init", parents=[global_parser], help="Initialize Yves")
-    sub_parsers.add_parser("check", parents=[global_parser], help="Check if LLM works")
-    sub_parsers.add_parser("summarize", parents=[global_parser], help="Summarize")
-    sub_parsers.add_parser(
-        "record", parents=[global_parser], help="Watch and summarize"
-    )
-    sub_parsers.add_parser(
-        "describe", parents=[global_parser], help="Show configuration"
-    )
-    sub_parsers.add_parser("version", parents=[global_parser], help="Package version")
-    p_args = parser.parse_args()
+def load_summarizer(config_path: str) -> "LLMSummarizer":
+    """Create the summarizer from the configuration file.
 
-    if p_args.command is None:
-        parser.print_help()
-        exit(0)
+    Parameters
+    ----------
+    config_path : str
+        Path to the configuration file
 
-    logging.basicConfig(
-        level=logging.DEBUG if p_args.debug else logging.INFO,
-        format="%(asctime)s - %(name)s - [%(levelname)s] - %(message)s",
-    )
+    Returns
+    -------
+    LLMSummarizer
+        Summarizer updated from `config_path`
 
-    logger = logging.getLogger(__name__)
+    """
+    from lib.llm_summarizer import LLMSummarizer, update_from_config
 
-    logger.debug(f"Subcommand: {p_args.command}")
-    if p_args.command == "version":
-        from importlib.metadata import version
+    summarizer = LLMSummarizer()
+    update_from_config(summarizer, config_path)
+
+    return summarizer
+
+
+def run_version(p_args: argparse.Namespace) -> None:
+    """Print the package version.
+
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
+
+    """
+    from importlib.metadata import version
+
+    print(f"Yves {version('yves')}")
+
+
+def run_init(p_args: argparse.Namespace) -> None:
+    """Initialize Yves interactively.
+
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
+
+    """
+    from lib.interactive import configure_interactively
+
+    configure_interactively()
+
+
+def run_check(p_args: argparse.Namespace) -> None:
+    """Check the configuration and the LLM.
+
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
+
+    """
+    from lib.check import check_all
+
+    config_path = os.path.expanduser(p_args.config)
+    summarizer = load_summarizer(config_path)
+
+    check_all(config_path, summarizer)
+
+
+def run_describe(p_args: argparse.Namespace) -> None:
+    """Print the configuration.
 
-        print(f"Yves {version('yves')}")
-    elif p_args.command == "init":
-        from lib.interactive import configure_interactively
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
 
-        configure_interactively()
-    elif p_args.command == "check":
-        from lib.check import check_all
+    """
+    from lib.cfg import parse_config, print_config
 
-        config_path = os.path.expanduser(p_args.config)
-        summarizer = LLMSummarizer()
-        llm_update_from_config(summarizer, config_path)
+    config_path = os.path.expanduser(p_args.config)
+    cfg = parse_config(config_path)
+    print_config(cfg)
 
-        check_all(os.path.expanduser(p_args.config), summarizer)
-    elif p_args.command == "describe":
-        from lib.cfg import parse_config, print_config
 
-        config_path = os.path.expanduser(p_args.config)
-        cfg = parse_config(config_path)
-        print_config(cfg)
-    elif p_args.command == "summarize":
-        from threading import Event
+def run_summarize(p_args: argparse.Namespace) -> None:
+    """Summarize the current logs.
 
-        config_path = os.path.expanduser(p_args.config)
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
 
-        summarizer = LLMSummarizer()
-        llm_update_from_config(summarizer, config_path)
+    """
+    from threading import Event
 
-        empty_event = Event()
-        generate_summary(summarizer, empty_event, wait_to_summarize=False)
-    else:
-        from threading import Event, Thread
+    from lib.llm_summarizer import generate_summary
 
-        from lib.file_system_watcher import FileSystemWatcher
-        from lib.file_system_watcher import update_from_config as fs_update_from_config
-        from lib.file_system_watcher import watch as fs_watch
-        from lib.signal import setup_signal_handler
-        from lib.threading import make_runner
-        from lib.tmux_watcher import TmuxWatcher
-        from lib.tmux_watcher import update_from_config as tmux_update_from_config
-        from lib.tmux_watcher import watch as tmux_watch
+    summarizer = load_summarizer(os.path.expanduser(p_args.config))
 
-        config_path = os.path.expanduser(p_args.config)
+    empty_event = Event()
+    generate_summary(summarizer, empty_event, wait_to_summarize=False)
 
-        fs_watcher = FileSystemWatcher()
-        fs_update_from_config(fs_watcher, config_path)
-        tmux_watcher = TmuxWatcher()
-        tmux_update_from_config(tmux_watcher, config_path)
-        summarizer = LLMSummarizer()
-        llm_update_from_config(summarizer, config_path)
 
-        stop_event = Event()
-        setup_signal_handler(stop_event)
+def run_record(p_args: argparse.Namespace) -> None:
+    """Watch the file system and tmux, and summarize every day.
 
-        exceptions = []
+    Parameters
+    ----------
+    p_args : argparse.Namespace
+        Parsed command line arguments
 
-        threads = [
+    """
+    from threading import Event, Thread
+
+    from lib.file_system_watcher import FileSystemWatcher
+    from lib.file_system_watcher import update_from_config as fs_update_from_config
+    from lib.file_system_watcher import watch as fs_watch
+    from lib.llm_summarizer import generate_summary
+    from lib.signal import setup_signal_handler
+    from lib.threading import make_runner
+    from lib.tmux_watcher import TmuxWatcher
+    from lib.tmux_watcher import update_from_config as tmux_update_from_config
+    from lib.tmux_watcher import watch as tmux_watch
+
+    config_path = os.path.expanduser(p_args.config)
+
+    fs_watcher = FileSystemWatcher()
+    fs_update_from_config(fs_watcher, config_path)
+    tmux_watcher = TmuxWatcher()
+    tmux_update_from_config(tmux_watcher, config_path)
+    summarizer = load_summarizer(config_path)
+
+    stop_event = Event()
+    setup_signal_handler(stop_event)
+
+    exceptions = []
+
+    threads = [
+        Thread(
+            target=make_runner(
+                generate_summary,
+                summarizer,
+                stop_event=stop_event,
+                exceptions=exceptions,
+            )
+        ),
+    ]
+
+    if fs_watcher.enable:
+        threads.append(
             Thread(
                 target=make_runner(
-                    generate_summary,
-                    summarizer,
+                    fs_watch,
+                    fs_watcher,
                     stop_event=stop_event,
                     exceptions=exceptions,
                 )
-            ),
-        ]
-
-        if fs_watcher.enable:
-            threads.append(
-                Thread(
-                    target=make_runner(
-                        fs_watch,
-                        fs_watcher,
-                        stop_event=stop_event,
-                        exceptions=exceptions,
-                    )
-                )
             )
+        )
 
-        if tmux_watcher.enable:
-            threads.append(
-                Thread(
-                    target=make_runner(
-                        tmux_watch,
-                        tmux_watcher,
-                        stop_event=stop_event,
-                        exceptions=exceptions,
-                    )
+    if tmux_watcher.enable:
+        threads.append(
+            Thread(
+                target=make_runner(
+                    tmux_watch,
+                    tmux_watcher,
+                    stop_event=stop_event,
+                    exceptions=exceptions,
                 )
             )
+        )
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    if exceptions:
+        for exception in exceptions:
+            logging.error(f"Failure of {exception}")
+        exit(1)
+
 
-        for thread in threads:
-            thread.start()
+# Subcommands with their help message and function to run
+COMMANDS = {
+    "init": ("Initialize Yves", run_init),
+    "check": ("Check if LLM works", run_check),
+    "summarize": ("Summarize", run_summarize),
+    "record": ("Watch and summarize", run_record),
+    "describe": ("Show configuration", run_describe),
+    "version": ("Package version", run_version),
+}
 
-        for thread in threads:
-            thread.join()
 
-        if exceptions:
-            for exception in exceptions:
-                logging.error(f"Failure of {exception}")
-            exit(1)
+def main():
+    """Execute main function."""
+    global_parser = argparse.ArgumentParser(add_help=False)
+    global_parser.add_argument(
+        "--config",
+        "-c",
+        type=str,
+        default="~/.config/yves/config",
+        help="Path to configuration file",
+    )
+    global_parser.add_argument("--debug", action="store_true", help="Debug logging")
+
+    parser = argparse.ArgumentParser()
+    sub_parsers = parser.add_subparsers(dest="command")
+    for command, (command_help, _) in COMMANDS.items():
+        sub_parsers.add_parser(command, parents=[global_parser], help=command_help)
+    p_args = parser.parse_args()
+
+    if p_args.command is None:
+        parser.print_help()
+        exit(0)
+
+    logging.basicConfig(
+        level=logging.DEBUG if p_args.debug else logging.INFO,
+        format="%(asctime)s - %(name)s - [%(levelname)s] - %(message)s",
+    )
+
+    logger.debug(f"Subcommand: {p_args.command}")
+    _, run = COMMANDS[p_args.command]
+    run(p_args)
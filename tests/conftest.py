@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def samples_dir() -> Path:
+    """Return the directory holding test samples."""
+    return Path(__file__).parent / "samples"
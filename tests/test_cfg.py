@@ -6,14 +6,13 @@ from configparser import ConfigParser
 def test_parse_config(tmp_path):
     """Test `parse_config` if it creates a default configuration file."""
     import os
-    from uuid import uuid4
 
     from lib.cfg import default_config, parse_config
 
     def config_to_dict(cfg: ConfigParser) -> dict[str, dict[str, str]]:
         return {section: dict(cfg.items(section)) for section in cfg.sections()}
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config"
     default_cfg = default_config()
 
     cfg = parse_config(abs_path)
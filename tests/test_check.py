@@ -11,42 +11,46 @@ def test_command_exists():
 
 def test_check_config(tmp_path):
     """Test `check_config` if it correctly checks configuration file values."""
-    from uuid import uuid4
-
     from lib.cfg import default_config, write_config
     from lib.check import check_config
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_default"
     default_cfg = default_config()
     write_config(default_cfg, abs_path)
     assert check_config(abs_path)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_negative_min_lines"
     default_cfg = default_config()
     default_cfg["filesystem"]["min_lines_changed"] = "-1"
     write_config(default_cfg, abs_path)
     assert not check_config(abs_path)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_max_similarity"
     default_cfg = default_config()
     default_cfg["filesystem"]["similarity_threshold"] = "1"
     write_config(default_cfg, abs_path)
     assert check_config(abs_path)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_min_similarity"
     default_cfg = default_config()
     default_cfg["filesystem"]["similarity_threshold"] = "0"
     write_config(default_cfg, abs_path)
     assert check_config(abs_path)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_negative_similarity"
     default_cfg = default_config()
     default_cfg["filesystem"]["similarity_threshold"] = "-0.01"
     write_config(default_cfg, abs_path)
     assert not check_config(abs_path)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config_too_large_similarity"
     default_cfg = default_config()
     default_cfg["filesystem"]["similarity_threshold"] = "1.2"
     write_config(default_cfg, abs_path)
     assert not check_config(abs_path)
+
+    abs_path = tmp_path / "config_negative_max_file_size"
+    default_cfg = default_config()
+    default_cfg["filesystem"]["max_file_size"] = "-1"
+    write_config(default_cfg, abs_path)
+    assert not check_config(abs_path)
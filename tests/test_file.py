@@ -61,17 +61,42 @@ def test_get_blake3(tmp_path):
     )
 
 
+def test_get_blake3_and_content(tmp_path):
+    """Test `get_blake3_and_content` if it matches `get_blake3` and `get_content`."""
+    from lib.file import get_blake3, get_blake3_and_content, get_content
+
+    text_file = tmp_path / "text.txt"
+    text_file.write_bytes("Hello,\r\nI am Yves.\rBonjour é\n".encode())
+    assert get_blake3_and_content(str(text_file)) == (
+        bytes.fromhex(get_blake3(str(text_file))),
+        get_content(str(text_file)),
+    )
+
+    binary_file = tmp_path / "example.bin"
+    binary_file.write_bytes(b"\x00\x01\x02\x03\x04")
+    assert get_blake3_and_content(str(binary_file)) == (
+        bytes.fromhex(get_blake3(str(binary_file))),
+        None,
+    )
+    # hashed from a memory map
+    assert get_blake3_and_content(str(binary_file), mmap_size=1) == (
+        bytes.fromhex(get_blake3(str(binary_file))),
+        None,
+    )
+
+    assert get_blake3_and_content(str(tmp_path / "missing.txt")) is None
+
+
 def test_find_file_in_dirs(tmp_path):
     """Test `find_file_in_dirs`."""
     from random import choice
-    from uuid import uuid4
 
     from lib.file import find_file_in_dirs
 
-    dirs_path = [tmp_path / f"{uuid4().hex}" for _ in range(10)]
+    dirs_path = [tmp_path / f"dir_{i}" for i in range(10)]
     parent_dir = choice(dirs_path)
     abs_path = parent_dir / "find_me_please.txt"
-    non_existent_dirs_path = [tmp_path / f"{uuid4().hex}" for _ in range(10)]
+    non_existent_dirs_path = [tmp_path / f"missing_dir_{i}" for i in range(10)]
 
     assert find_file_in_dirs(abs_path, dirs_path) == parent_dir
     assert find_file_in_dirs(abs_path, non_existent_dirs_path) is None
@@ -1,38 +1,36 @@
 """Test lib/file_system_watcher.py."""
 
+CONFIG_TEMPLATE = """\
+[filesystem]
+enable = false
+dirs = ~, . ,/home/me
+output_file = new_output_file.json
+include_filetypes = .py ,.nix,.nu
+exclude_filetypes = .o
+major_changes_only = True
+min_lines_changed = 6
+similarity_threshold = 0.4
+
+[tmux]
+output_file = tmux_output_file.json
+
+[summarizer]
+output_dir = {output_dir}
+"""
+
 
 def test_update_from_config(tmp_path):
     """Test `update_from_config` if it updates the current `FileSystemWatcher` instance."""
     import os
-    from configparser import ConfigParser
-    from uuid import uuid4
 
     from lib.file_system_watcher import FileSystemWatcher, update_from_config
 
-    abs_path = tmp_path / f"{uuid4().hex}"
+    abs_path = tmp_path / "config"
     summarize_output_dir = tmp_path / "summarize_dir"
     default_watcher = FileSystemWatcher()
     watcher = FileSystemWatcher()
 
-    config = ConfigParser()
-    config["filesystem"] = {
-        "enable": "false",
-        "dirs": "~, . ,/home/me",
-        "output_file": "new_output_file.json",
-        "include_filetypes": ".py ,.nix,.nu",
-        "exclude_filetypes": ".o",
-        "major_changes_only": "True",
-        "min_lines_changed": "6",
-        "similarity_threshold": "0.4",
-    }
-    config["tmux"] = {
-        "output_file": "tmux_output_file.json",
-    }
-    config["summarizer"] = {
-        "output_dir": summarize_output_dir,
-    }
-    with open(abs_path, "w") as f:
-        config.write(f)
+    abs_path.write_text(CONFIG_TEMPLATE.format(output_dir=summarize_output_dir))
 
     update_from_config(watcher, abs_path)
     assert default_watcher != watcher
@@ -60,8 +58,15 @@ def test_normalize_line():
         "#This is a comment",
         "//   This is another    comment",
         "   This  is    a line   with lots of       spaces",
+        "This\tis a line\u00a0with other whitespaces",
+    ]
+    outputs = [
+        "This is a normal line.",
+        "",
+        "",
+        "This is a line with lots of spaces",
+        "This is a line with other whitespaces",
     ]
-    outputs = ["This is a normal line.", "", "", "This is a line with lots of spaces"]
 
     watcher.major_changes_only = True
     for inp, out in zip(inputs, outputs):
@@ -70,3 +75,339 @@ def test_normalize_line():
     watcher.major_changes_only = False
     for inp in inputs:
         assert normalize_line(watcher, inp) == inp
+
+
+def test_generate_diff():
+    """Test `generate_diff` if it matches `difflib.unified_diff` on long files."""
+    from difflib import unified_diff
+
+    from lib.file_system_watcher import generate_diff
+
+    old_lines = [f"line {i}\n" for i in range(1000)]
+    new_lines = list(old_lines)
+    new_lines[10] = "changed line\n"
+    del new_lines[500]
+    new_lines.insert(800, "inserted line\n")
+
+    assert generate_diff(old_lines, new_lines, "repo/file.txt") == "\n".join(
+        unified_diff(
+            old_lines,
+            new_lines,
+            fromfile="a/repo/file.txt",
+            tofile="b/repo/file.txt",
+            lineterm="",
+        )
+    )
+    assert generate_diff(old_lines, list(old_lines), "repo/file.txt") is None
+
+    # frequent lines are matched too, `difflib.unified_diff` rewrites the whole file
+    old_lines = ["{\n", "}\n"] * 150
+    new_lines = list(old_lines)
+    new_lines.insert(20, "inserted line\n")
+    del new_lines[281]
+    diff = generate_diff(old_lines, new_lines, "repo/file.txt")
+    assert sum(line[:1] in ("+", "-") for line in diff.splitlines()[2:]) < 10
+
+    # new file
+    for new_lines in (old_lines, old_lines[:1]):
+        assert generate_diff([], new_lines, "repo/file.txt") == "\n".join(
+            unified_diff(
+                [],
+                new_lines,
+                fromfile="a/repo/file.txt",
+                tofile="b/repo/file.txt",
+                lineterm="",
+            )
+        )
+    assert generate_diff([], [], "repo/file.txt") is None
+
+
+def test_is_major_change():
+    """Test `is_major_change`."""
+    from lib.file_system_watcher import (
+        FileSystemWatcher,
+        is_major_change,
+        normalize_line,
+    )
+
+    watcher = FileSystemWatcher(major_changes_only=True, similarity_threshold=0.7)
+    old_lines = ["x = compute(1)\n", "y = x + 1\n"]
+
+    assert not is_major_change(watcher, old_lines, list(old_lines), "main.txt")
+    # whitespaces are ignored
+    assert not is_major_change(
+        watcher, old_lines, ["x  =  compute(1)\n", "y = x + 1\n"], "main.txt"
+    )
+    # typo
+    assert not is_major_change(
+        watcher, old_lines, ["x = compute(2)\n", "y = x + 1\n"], "main.txt"
+    )
+    # added line does not shift the following ones
+    assert not is_major_change(
+        watcher, old_lines, ["print(x)\n", *old_lines], "main.txt"
+    )
+    # line rewritten
+    assert is_major_change(
+        watcher, old_lines, ["total = sum(values)\n", "y = x + 1\n"], "main.txt"
+    )
+    # code keyword
+    assert is_major_change(watcher, old_lines, [*old_lines, "return y\n"], "main.py")
+    assert is_major_change(watcher, old_lines, [*old_lines, "} CATCH (e) {\n"], "a.js")
+    assert not is_major_change(
+        watcher, old_lines, [*old_lines, "return y\n"], "main.txt"
+    )
+
+    # already normalized lines are reused
+    new_lines = ["total = sum(values)\n", "y = x + 1\n"]
+    assert is_major_change(
+        watcher,
+        old_lines,
+        new_lines,
+        "main.txt",
+        [normalize_line(watcher, line) for line in old_lines],
+        [normalize_line(watcher, line) for line in new_lines],
+    )
+
+    watcher.major_changes_only = False
+    assert is_major_change(watcher, old_lines, list(old_lines), "main.txt")
+
+
+def test_scan_files(tmp_path):
+    """Test `scan_files` if it filters filetypes and skips hidden or excluded paths."""
+    from lib.file_system_watcher import FileSystemWatcher, scan_files
+
+    watch_dir = tmp_path / "repo"
+    for rel_path in (
+        "main.py",
+        "README.md",
+        "lib/util.py",
+        "lib/util.pyc",
+        ".hidden.py",
+        ".git/config.py",
+        "build.pyc/generated.py",
+        "changes.py",
+    ):
+        (watch_dir / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (watch_dir / rel_path).write_text("")
+
+    watcher = FileSystemWatcher(
+        dirs=[str(watch_dir)],
+        output_file=str(watch_dir / "changes.py"),
+        summary_output_dir=str(tmp_path / "summaries"),
+        exclude_filetypes={".pyc"},
+    )
+    files = scan_files(watcher)
+    assert {p: display_path for p, (display_path, _) in files.items()} == {
+        str(watch_dir / p): f"repo/{p}" for p in ("main.py", "README.md", "lib/util.py")
+    }
+    assert all(stat.st_size == 0 for _, stat in files.values())
+
+    watcher.include_filetypes = {".py"}
+    assert sorted(scan_files(watcher)) == sorted(
+        str(watch_dir / p) for p in ("main.py", "lib/util.py")
+    )
+
+
+def test_check_for_changes(tmp_path):
+    """Test `check_for_changes` if it only reports files whose content changed."""
+    import os
+
+    from lib.file_system_watcher import (
+        FileSnapshot,
+        FileSystemWatcher,
+        check_for_changes,
+    )
+
+    watch_dir = tmp_path / "repo"
+    watch_dir.mkdir()
+    file_path = watch_dir / "main.py"
+    file_path.write_text("print('hello')\n")
+
+    watcher = FileSystemWatcher(
+        dirs=[str(watch_dir)],
+        output_file=str(tmp_path / "changes.json"),
+        summary_output_dir=str(tmp_path / "summaries"),
+    )
+
+    changes = check_for_changes(watcher)
+    assert [(c.type, c.file) for c in changes] == [("new", str(file_path))]
+    assert changes[0].display_path == "repo/main.py"
+    stat = file_path.stat()
+    assert watcher.file_snapshots == {
+        str(file_path): FileSnapshot(
+            watcher.file_snapshots[str(file_path)].hash,
+            stat.st_size,
+            stat.st_mtime_ns,
+            ["print('hello')\n"],
+        )
+    }
+    assert check_for_changes(watcher) == []
+
+    # same content with a new modification time
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert check_for_changes(watcher) == []
+
+    file_path.write_text("print('hello')\nprint('world')\n")
+    changes = check_for_changes(watcher)
+    assert [(c.type, c.file) for c in changes] == [("modified", str(file_path))]
+    assert "+print('world')" in changes[0].diff
+
+    # first change after a quiet period: still checked every time
+    snapshot = watcher.file_snapshots[str(file_path)]
+    assert snapshot.change_streak == 1
+    assert snapshot.next_check == 0.0
+
+    # changed again right away: backs off, then checked later
+    file_path.write_text("print('hello')\nprint('world')\nprint('!')\n")
+    changes = check_for_changes(watcher)
+    assert [(c.type, c.file) for c in changes] == [("modified", str(file_path))]
+    snapshot = watcher.file_snapshots[str(file_path)]
+    assert snapshot.change_streak == 2
+    assert snapshot.next_check > 0.0
+    file_path.write_text("print('hello')\nprint('world')\nprint('?!')\n")
+    assert check_for_changes(watcher) == []
+
+    snapshot.next_check = 0.0
+    changes = check_for_changes(watcher)
+    assert [(c.type, c.file) for c in changes] == [("modified", str(file_path))]
+    snapshot = watcher.file_snapshots[str(file_path)]
+    assert snapshot.change_streak == 3
+
+    # unchanged: back to every check
+    snapshot.next_check = 0.0
+    assert check_for_changes(watcher) == []
+    assert snapshot.change_streak == 0
+
+    # saved again with the same content: back to every check
+    file_path.write_text("print('hello')\n")
+    assert len(check_for_changes(watcher)) == 1
+    file_path.write_text("print('hello')\nprint('world')\n")
+    assert len(check_for_changes(watcher)) == 1
+    snapshot = watcher.file_snapshots[str(file_path)]
+    assert snapshot.next_check > 0.0
+    snapshot.next_check = 0.0
+    file_path.write_text("print('hello')\nprint('world')\n")
+    os.utime(file_path, ns=(0, file_path.stat().st_mtime_ns + 1_000_000_000))
+    assert check_for_changes(watcher) == []
+    assert snapshot.change_streak == 0
+    assert snapshot.next_check == 0.0
+
+
+def test_watch_backoff(tmp_path):
+    """Test `watch` backs off while files are idle and resets when a file changes."""
+    from threading import Event
+
+    from lib.file_system_watcher import FileSystemWatcher, watch
+
+    class EditingEvent(Event):
+        """Record waits, edit `file_path` after `edit_at` waits and stop after `n_waits`."""
+
+        def __init__(self, file_path, edit_at, n_waits):
+            super().__init__()
+            self.file_path = file_path
+            self.edit_at = edit_at
+            self.n_waits = n_waits
+            self.waits = []
+
+        def wait(self, timeout=None):
+            self.waits.append(timeout)
+            if len(self.waits) == self.edit_at:
+                self.file_path.write_text("print('hello')\nprint('world')\n")
+            if len(self.waits) == self.n_waits:
+                self.set()
+            return self.is_set()
+
+    for i, (edit_at, timeout, max_timeout, expected_waits) in enumerate(
+        [
+            (None, 1, 4, [1, 2, 4, 4, 4]),
+            (2, 1, 4, [1, 2, 1, 1, 2]),
+            # `timeout` is never shortened by a smaller `max_timeout`
+            (None, 5, 2, [5, 5, 5]),
+        ]
+    ):
+        watch_dir = tmp_path / f"repo{i}"
+        watch_dir.mkdir()
+        file_path = watch_dir / "main.py"
+        file_path.write_text("print('hello')\n")
+        watcher = FileSystemWatcher(
+            dirs=[str(watch_dir)],
+            output_file=str(tmp_path / f"changes{i}.json"),
+            summary_output_dir=str(tmp_path / "summaries"),
+        )
+        stop_event = EditingEvent(file_path, edit_at, len(expected_waits))
+
+        watch(watcher, stop_event, timeout, max_timeout)
+        assert stop_event.waits == expected_waits
+
+
+def test_read_files(tmp_path):
+    """Test `read_files` if it keeps the order of `file_paths`."""
+    import os
+
+    from lib.file import get_blake3_and_content
+    from lib.file_system_watcher import read_files
+
+    file_paths = []
+    for i in range(8):
+        file_path = tmp_path / f"file_{i}.txt"
+        file_path.write_text(f"line {i}\n" * i)
+        file_paths.append(str(file_path))
+    file_paths.append(str(tmp_path / "missing.txt"))
+
+    expected = [get_blake3_and_content(p) for p in file_paths]
+    assert expected[-1] is None
+    assert read_files(file_paths) == expected
+    # read in inode order, returned in the same order
+    stats = [os.stat(p) for p in file_paths[:-1]]
+    assert read_files(file_paths[:-1], stats) == expected[:-1]
+    assert read_files(file_paths[:1]) == expected[:1]
+    assert read_files([]) == []
+
+
+def test_write_changes_to_file(tmp_path):
+    """Test `write_changes_to_file` if it appends one JSON event per line."""
+    import json
+
+    from lib.file_system_watcher import (
+        Change,
+        FileSystemWatcher,
+        close_output_file,
+        write_changes_to_file,
+    )
+
+    output_file = tmp_path / "fs" / "changes.json"
+    output_file.parent.mkdir()
+    # JSON array written by previous versions
+    old_event = {"event_type": "changes_detected", "timestamp": 0, "changes": []}
+    output_file.write_text(json.dumps([old_event], indent=2))
+
+    watcher = FileSystemWatcher(output_file=str(output_file))
+    change = Change(
+        "modified",
+        "/home/me/repo/main.py",
+        "repo/main.py",
+        "--- a/repo/main.py\n+++ b/repo/main.py",
+    )
+
+    write_changes_to_file(watcher, [])
+    assert watcher.output_stream is None
+
+    write_changes_to_file(watcher, [change])
+    write_changes_to_file(watcher, [change, change])
+
+    # events are flushed after each tick
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    close_output_file(watcher)
+    assert watcher.output_stream is None
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == old_event
+    event = json.loads(lines[1])
+    assert event["changes"] == [
+        {
+            "file": "repo/main.py",
+            "status": "modified",
+            "diff": ["--- a/repo/main.py", "+++ b/repo/main.py"],
+            "is_binary": False,
+        }
+    ]
+    assert len(json.loads(lines[2])["changes"]) == 2
@@ -1,17 +1,30 @@
 """Test lib/interactive.py."""
 
 import os
+from unittest.mock import Mock
 
+import pytest
 import questionary
 
+from lib.cfg import ConfigParser
+from lib.interactive import (
+    ask_and_update_fs_dirs,
+    ask_and_update_fs_enable,
+    ask_and_update_fs_exclude,
+    ask_and_update_llm_provider,
+    ask_and_update_summarizer,
+    ask_and_update_tmux_enable,
+    ask_config_path,
+    ask_formatter,
+    ask_overwrite_config,
+    is_valid_formatter,
+    is_valid_hour,
+)
+
 
 def test_ask_config_path(tmp_path, monkeypatch):
     """Test `ask_config_path` if it creates the directory and return the right answer."""
-    from uuid import uuid4
-
-    from lib.interactive import ask_config_path
-
-    dir_cfg_path = tmp_path / f"{uuid4().hex}"
+    dir_cfg_path = tmp_path / "yves"
     cfg_path = dir_cfg_path / "config"
     assert not os.path.exists(cfg_path)
     assert not dir_cfg_path.exists()
@@ -25,39 +38,29 @@ def test_ask_config_path(tmp_path, monkeypatch):
 
 def test_ask_overwrite_config(tmp_path, monkeypatch):
     """Test `ask_overwrite_config`."""
-    from lib.interactive import ask_overwrite_config
-
     monkeypatch.setattr(questionary.Question, "ask", lambda _: True)
     result = ask_overwrite_config(tmp_path)
     assert result is True
 
 
-def test_ask_and_update_fs_enable(monkeypatch):
+@pytest.mark.parametrize(("answer", "expected"), [(True, "True"), (False, "False")])
+def test_ask_and_update_fs_enable(monkeypatch, answer, expected):
     """Test `ask_and_update_fs_enable`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_fs_enable
-
     cfg = ConfigParser()
     cfg["filesystem"] = {}
 
-    monkeypatch.setattr(questionary.Question, "ask", lambda _: True)
-    result = ask_and_update_fs_enable(cfg)
-    assert result is True
-    assert cfg["filesystem"]["enable"] == "True"
-
-    monkeypatch.setattr(questionary.Question, "ask", lambda _: False)
+    monkeypatch.setattr(questionary.Question, "ask", lambda _: answer)
     result = ask_and_update_fs_enable(cfg)
-    assert result is False
-    assert cfg["filesystem"]["enable"] == "False"
+    assert result is answer
+    assert cfg["filesystem"]["enable"] == expected
 
 
 def test_ask_and_update_fs_dirs(monkeypatch):
     """Test `ask_and_update_fs_dirs`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_fs_dirs
-
-    answers = iter(["/tmp/a/directory", "~/test/another/directory", ""])
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    monkeypatch.setattr(
+        "questionary.Question.ask",
+        Mock(side_effect=["/tmp/a/directory", "~/test/another/directory", ""]),
+    )
 
     cfg = ConfigParser()
     cfg["filesystem"] = {}
@@ -69,9 +72,6 @@ def test_ask_and_update_fs_dirs(monkeypatch):
 
 def test_ask_and_update_fs_exclude(monkeypatch):
     """Test `ask_and_update_fs_exclude`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_fs_exclude
-
     answers = ["*.pyo", "*~", ".git"]
     monkeypatch.setattr("questionary.Question.ask", lambda _: answers)
 
@@ -83,32 +83,22 @@ def test_ask_and_update_fs_exclude(monkeypatch):
     assert cfg["filesystem"]["exclude_filetypes"] == ".pyo, ~, .git"
 
 
-def test_ask_and_update_tmux_enable(monkeypatch):
+@pytest.mark.parametrize(("answer", "expected"), [(True, "True"), (False, "False")])
+def test_ask_and_update_tmux_enable(monkeypatch, answer, expected):
     """Test `ask_and_update_tmux_enable`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_tmux_enable
-
     cfg = ConfigParser()
     cfg["tmux"] = {}
 
-    monkeypatch.setattr(questionary.Question, "ask", lambda _: True)
-    result = ask_and_update_tmux_enable(cfg)
-    assert result is True
-    assert cfg["tmux"]["enable"] == "True"
-
-    monkeypatch.setattr(questionary.Question, "ask", lambda _: False)
+    monkeypatch.setattr(questionary.Question, "ask", lambda _: answer)
     result = ask_and_update_tmux_enable(cfg)
-    assert result is False
-    assert cfg["tmux"]["enable"] == "False"
+    assert result is answer
+    assert cfg["tmux"]["enable"] == expected
 
 
 def test_ask_and_update_llm_provider(monkeypatch):
     """Test `ask_and_update_llm_provider`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_llm_provider
-
-    answers = iter(["anthropic", "claude-opus-4-1-20250805", "my-VERY-private-$3Cr37"])
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    answers = ["anthropic", "claude-opus-4-1-20250805", "my-VERY-private-$3Cr37"]
+    monkeypatch.setattr("questionary.Question.ask", Mock(side_effect=answers))
 
     cfg = ConfigParser()
     cfg["llm"] = {}
@@ -122,33 +112,32 @@ def test_ask_and_update_llm_provider(monkeypatch):
     }
 
 
-def test_is_valid_hour():
+@pytest.mark.parametrize(
+    ("hour", "expected"),
+    [
+        ("19:00", True),
+        ("00:00", True),
+        ("wrong-hour", False),
+        ("25:00", False),
+        ("10:86", False),
+        ("98:86", False),
+        ("-00:00", False),
+        ("-10:01", False),
+    ],
+)
+def test_is_valid_hour(hour, expected):
     """Test `is_valid_hour`."""
-    from lib.interactive import is_valid_hour
-
-    assert is_valid_hour("19:00")
-    assert is_valid_hour("00:00")
-    assert not is_valid_hour("wrong-hour")
-    assert not is_valid_hour("25:00")
-    assert not is_valid_hour("10:86")
-    assert not is_valid_hour("98:86")
-    assert not is_valid_hour("-00:00")
-    assert not is_valid_hour("-10:01")
+    assert is_valid_hour(hour) is expected
 
 
 def test_ask_and_update_summarizer(tmp_path, monkeypatch):
     """Test `ask_and_update_summarizer` by also creating the directory if it does not exist yet."""
-    from uuid import uuid4
-
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_and_update_summarizer
-
-    summary_dir = tmp_path / f"{uuid4().hex}" / "summaries"
+    summary_dir = tmp_path / "summaries"
     assert not summary_dir.exists()
 
-    answers = iter([str(summary_dir), "19:30"])
-
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    monkeypatch.setattr(
+        "questionary.Question.ask", Mock(side_effect=[str(summary_dir), "19:30"])
+    )
     cfg = ConfigParser()
     cfg["summarizer"] = {}
     ask_and_update_summarizer(cfg)
@@ -159,8 +148,6 @@ def test_ask_and_update_summarizer(tmp_path, monkeypatch):
 
 def test_is_valid_formatter():
     """Test `is_valid_formatter`."""
-    from lib.interactive import is_valid_formatter
-
     assert is_valid_formatter("None")
 
     # NOTE: command needs to exist
@@ -170,26 +157,23 @@ def test_is_valid_formatter():
 
 def test_ask_formatter(monkeypatch):
     """Test `ask_formatter`."""
-    from lib.cfg import ConfigParser
-    from lib.interactive import ask_formatter
-
-    answers = iter(["None"])
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    monkeypatch.setattr("questionary.Question.ask", Mock(side_effect=["None"]))
     cfg = ConfigParser()
     cfg["formatter"] = {}
     ask_formatter(cfg, ["prettier", "None"])
     assert cfg["formatter"]["enable"] == "False"
 
-    answers = iter(["pytest"])
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    monkeypatch.setattr("questionary.Question.ask", Mock(side_effect=["pytest"]))
     cfg = ConfigParser()
     cfg["formatter"] = {}
     ask_formatter(cfg, ["pytest", "None"])
     assert cfg["formatter"]["enable"] == "True"
     assert cfg["formatter"]["command"] == "pytest"
 
-    answers = iter(["formatter-that-does-not_exist", "pytest"])
-    monkeypatch.setattr("questionary.Question.ask", lambda _: next(answers))
+    monkeypatch.setattr(
+        "questionary.Question.ask",
+        Mock(side_effect=["formatter-that-does-not_exist", "pytest"]),
+    )
     cfg = ConfigParser()
     cfg["formatter"] = {}
     ask_formatter(cfg, ["pytest", "None"])
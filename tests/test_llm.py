@@ -1,61 +1,93 @@
 """Test lib/llm.py."""
 
+from functools import lru_cache
+from importlib.resources import files
+from json import dumps, loads
+from re import sub
+from typing import TYPE_CHECKING
 
-def test_merge_logs_by_timestamp(tmp_path):
-    """Test `merge_logs_by_timestamp`."""
-    from json import load, dump, dumps
-    from pathlib import Path
+import pytest
 
-    from lib.llm import merge_logs_by_timestamp
-    from importlib.resources import files
+from lib.llm import merge_logs_by_timestamp, split_json_by_token_limit
+from lib.llm_summarizer import multiply_prompt
 
-    fs_log_path = tmp_path / "fs_log_path.json"
-    fs_prompt_file = files("yves.check") / "fs_prompt_example.json"
-    with fs_prompt_file.open("r", encoding="utf-8") as f:
-        fs_log_data = load(f)
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
+
+
+@lru_cache(maxsize=None)
+def load_sample(path: "Traversable") -> bytes:
+    """Read a sample file once."""
+    return path.read_bytes()
+
+
+def load_sample_json(path: "Traversable") -> object:
+    """Parse a JSON sample file read once, each test gets its own object."""
+    return loads(load_sample(path))
 
-    with fs_log_path.open("w") as f:
-        dump(fs_log_data, f)
+
+def test_merge_logs_by_timestamp(tmp_path, samples_dir):
+    """Test `merge_logs_by_timestamp`."""
+    fs_log_path = tmp_path / "fs_log_path.json"
+    fs_log_path.write_bytes(load_sample(files("yves.check") / "fs_prompt_example.json"))
 
     tmux_log_path = tmp_path / "tmux_log_path.json"
-    tmux_prompt_file = (
-        Path(__file__).parent / "samples" / "prompts" / "tmux_prompt_example.json"
+    tmux_log_data = load_sample_json(
+        samples_dir / "prompts" / "tmux_prompt_example.json"
     )
-    with tmux_prompt_file.open("r", encoding="utf-8") as f:
-        tmux_log_data = load(f)
+    assert isinstance(tmux_log_data, list)
 
-    with tmux_log_path.open("w") as f:
-        dump(tmux_log_data, f)
+    # tmux watcher writes JSON Lines
+    tmux_log_path.write_text("".join(dumps(event) + "\n" for event in tmux_log_data))
 
-    merged_prompt_file = (
-        Path(__file__).parent / "samples" / "prompts" / "merged_prompt_example.json"
+    expected_merged = load_sample_json(
+        samples_dir / "prompts" / "merged_prompt_example.json"
     )
-    with merged_prompt_file.open("r", encoding="utf-8") as f:
-        expected_merged = load(f)
 
     merged_str = merge_logs_by_timestamp(tmux_log_path, fs_log_path)
 
-    assert merged_str == dumps(expected_merged, ensure_ascii=False, indent=0)
+    assert loads(merged_str) == expected_merged
 
 
-def test_split_json_by_token_limit():
-    """Test `split_json_by_token_limit`."""
-    from json import load
-    from importlib.resources import files
-    from lib.llm import split_json_by_token_limit
-    from lib.llm_summarizer import multiply_prompt
+def test_merge_logs_by_timestamp_legacy(tmp_path, samples_dir):
+    """Test `merge_logs_by_timestamp` gives the same events from a legacy JSON array log."""
+    tmux_log_data = load_sample_json(
+        samples_dir / "prompts" / "tmux_prompt_example.json"
+    )
+    assert isinstance(tmux_log_data, list)
 
-    prompt_file = files("yves.check") / "fs_prompt_example.json"
-    with prompt_file.open("r", encoding="utf-8") as f:
-        fs_log_data = load(f)
+    tmux_log_path = tmp_path / "tmux_log_path.json"
+    tmux_log_path.write_text("".join(dumps(event) + "\n" for event in tmux_log_data))
 
-    multiple_fs_log_json, fs_log_json, token_limit = multiply_prompt(
-        fs_log_data, factor=2
-    )
+    # previous versions wrote a JSON array with outputs split into lines
+    for event in tmux_log_data:
+        event["output"] = event["output"].splitlines()
+    legacy_tmux_log_path = tmp_path / "legacy_tmux_log_path.json"
+    legacy_tmux_log_path.write_text(dumps(tmux_log_data))
+
+    fs_log_path = tmp_path / "fs_log_path.json"
+    merged = loads(merge_logs_by_timestamp(tmux_log_path, fs_log_path))
+    assert merged == loads(merge_logs_by_timestamp(legacy_tmux_log_path, fs_log_path))
+    assert all(isinstance(event["output"], list) for event in merged)
+
+
+@pytest.fixture(scope="module")
+def doubled_fs_prompt() -> tuple[str, str, float]:
+    """Return the file system sample prompt doubled by `multiply_prompt`."""
+    fs_log_data = load_sample_json(files("yves.check") / "fs_prompt_example.json")
+    assert isinstance(fs_log_data, list)
+
+    return multiply_prompt(fs_log_data, factor=2)
+
+
+def test_split_json_by_token_limit(doubled_fs_prompt):
+    """Test `split_json_by_token_limit`."""
+    multiple_fs_log_json, fs_log_json, token_limit = doubled_fs_prompt
     splits = split_json_by_token_limit(multiple_fs_log_json, int(token_limit))
     assert len(splits) == 2
+    # `split_json_by_token_limit` collapses whitespaces, even inside strings
     assert (
-        splits[0].replace(" ", "")
-        == splits[1].replace(" ", "")
-        == fs_log_json.replace(" ", "")[1:-1]
+        loads("[" + splits[0] + "]")
+        == loads("[" + splits[1] + "]")
+        == loads(sub(r"\s+", " ", fs_log_json))
     )
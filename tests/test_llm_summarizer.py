@@ -1,45 +1,67 @@
 """Test lib/llm_summarizer.py."""
 
+import shutil
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from pathlib import Path
+from threading import Event
 
-def test_update_from_config(tmp_path):
-    """Test `update_from_config` if it updates the current `LLMSummarizer` instance."""
-    from configparser import ConfigParser
-    from datetime import datetime
-    from uuid import uuid4
+import pytest
 
-    from lib.llm_summarizer import LLMSummarizer, update_from_config
+from lib.cfg import default_config, write_config
+from lib.llm_summarizer import (
+    LAST_RUN_FILE,
+    LLMSummarizer,
+    format_summary,
+    generate_summary,
+    seconds_until_run_hour,
+    update_from_config,
+)
 
-    abs_path = tmp_path / f"{uuid4().hex}"
-    summarize_output_dir = tmp_path / "summarize_dir"
-    default_summarizer = LLMSummarizer()
-    summarizer = LLMSummarizer()
+DEFAULT_SUMMARIZER = LLMSummarizer()
+
+CONFIG_TEMPLATE = """\
+[filesystem]
+output_file = fs_output_file.json
+
+[tmux]
+output_file = tmux_output_file.json
+
+[llm]
+api_key = this-is-my-api-secret
+model_name = gpt-4o-mini
+provider = openai
+
+[summarizer]
+output_dir = {output_dir}
+token_limit = 154546
+at = 15:49
+
+[formatter]
+enable = True
+command = prettier
+"""
 
-    config = ConfigParser()
-    config["filesystem"] = {
-        "output_file": "fs_output_file.json",
-    }
-    config["tmux"] = {
-        "output_file": "tmux_output_file.json",
-    }
-    config["llm"] = {
-        "api_key": "this-is-my-api-secret",
-        "model_name": "gpt-4o-mini",
-        "provider": "openai",
-    }
-    config["summarizer"] = {
-        "output_dir": summarize_output_dir,
-        "token_limit": "154546",
-        "at": "15:49",
-    }
-    config["formatter"] = {
-        "enable": "True",
-        "command": "prettier",
-    }
-    with open(abs_path, "w") as f:
-        config.write(f)
 
-    update_from_config(summarizer, abs_path)
-    assert default_summarizer != summarizer
+@pytest.fixture(scope="session")
+def llm_summarizer_ini(tmp_path_factory) -> Path:
+    """Write the summarizer configuration file once."""
+    config_dir = tmp_path_factory.mktemp("summarizer")
+    config_path = config_dir / "config"
+    config_path.write_text(
+        CONFIG_TEMPLATE.format(output_dir=config_dir / "summarize_dir")
+    )
+    return config_path
+
+
+def test_update_from_config(llm_summarizer_ini):
+    """Test `update_from_config` if it updates the current `LLMSummarizer` instance."""
+    summarize_output_dir = llm_summarizer_ini.parent / "summarize_dir"
+    summarizer = LLMSummarizer()
+
+    update_from_config(summarizer, str(llm_summarizer_ini))
+    assert summarizer != DEFAULT_SUMMARIZER
     assert summarizer == LLMSummarizer(
         "this-is-my-api-secret",
         "gpt-4o-mini",
@@ -54,29 +76,161 @@ def test_update_from_config(tmp_path):
     )
 
 
-def test_format_summary(tmp_path):
-    """Test `format_summary`."""
-    import shutil
-    from pathlib import Path
-    from uuid import uuid4
+def test_update_from_config_last_run(tmp_path):
+    """Test `update_from_config` if it restores the last run day from `output_dir`."""
+    abs_path = tmp_path / "config"
+    summarize_output_dir = tmp_path / "summarize_dir"
+    summarize_output_dir.mkdir()
+    (summarize_output_dir / LAST_RUN_FILE).write_text("2025-09-18")
 
-    from lib.llm_summarizer import LLMSummarizer, format_summary
+    cfg = default_config()
+    cfg["summarizer"]["output_dir"] = str(summarize_output_dir)
+    write_config(cfg, str(abs_path))
 
-    llm_summarizer = LLMSummarizer()
-    original_report = Path(__file__).parent / "samples" / "reports" / "original.md"
-    copy_original_report = tmp_path / f"{uuid4().hex}.md"
+    summarizer = LLMSummarizer()
+    update_from_config(summarizer, str(abs_path))
+    assert summarizer.last_run_day == date(2025, 9, 18)
 
-    shutil.copyfile(original_report, copy_original_report)
-    format_summary(llm_summarizer, str(copy_original_report))
-    assert original_report.read_text() == copy_original_report.read_text()
 
-    llm_summarizer.formatter = "non-existant_formatter"
-    shutil.copyfile(original_report, copy_original_report)
-    format_summary(llm_summarizer, str(copy_original_report))
-    assert original_report.read_text() == copy_original_report.read_text()
+@pytest.fixture(scope="session")
+def reports(samples_dir) -> dict[str, bytes]:
+    """Read the sample reports once."""
+    return {
+        name: (samples_dir / "reports" / f"{name}.md").read_bytes()
+        for name in ("original", "prettier")
+    }
+
 
-    llm_summarizer.formatter = "prettier"
-    shutil.copyfile(original_report, copy_original_report)
+@pytest.mark.parametrize(
+    ("formatter", "expected_report"),
+    [
+        (None, "original"),
+        ("non-existant_formatter", "original"),
+        pytest.param(
+            "prettier",
+            "prettier",
+            marks=pytest.mark.skipif(
+                shutil.which("prettier") is None, reason="prettier not installed"
+            ),
+        ),
+    ],
+)
+def test_format_summary(tmp_path, reports, formatter, expected_report):
+    """Test `format_summary`."""
+    llm_summarizer = LLMSummarizer(formatter=formatter)
+    copy_original_report = tmp_path / "report.md"
+
+    copy_original_report.write_bytes(reports["original"])
     format_summary(llm_summarizer, str(copy_original_report))
-    prettier_report = Path(__file__).parent / "samples" / "reports" / "prettier.md"
-    assert prettier_report.read_text() == copy_original_report.read_text()
+    assert reports[expected_report] == copy_original_report.read_bytes()
+
+
+@pytest.mark.parametrize(
+    ("now", "run_hour", "expected"),
+    [
+        (datetime(2025, 9, 18, 18, 0), "19:00", 3600),
+        (datetime(2025, 9, 18, 19, 0), "19:00", 24 * 3600),
+        (datetime(2025, 9, 18, 20, 0), "19:00", 23 * 3600),
+        # Spring forward on 2025-03-30 and fall back on 2025-10-26 in Paris
+        (datetime(2025, 3, 29, 19, 0), "19:00", 23 * 3600),
+        (datetime(2025, 10, 25, 19, 0), "19:00", 25 * 3600),
+    ],
+)
+def test_seconds_until_run_hour(monkeypatch, now, run_hour, expected):
+    """Test `seconds_until_run_hour` in local time across DST transitions."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv("TZ", "Europe/Paris")
+    time.tzset()
+    try:
+        run_hour = datetime.strptime(run_hour, "%H:%M").time()
+        assert seconds_until_run_hour(run_hour, now) == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+class StopAfterEvent(Event):
+    """Event recording each wait and set after `n_waits` waits."""
+
+    def __init__(self, n_waits: int):
+        super().__init__()
+        self.n_waits = n_waits
+        self.waits = []
+
+    def wait(self, timeout=None):
+        """Record `timeout` instead of waiting."""
+        self.waits.append(timeout)
+        if len(self.waits) == self.n_waits:
+            self.set()
+        return self.is_set()
+
+
+@pytest.fixture
+def summarizer_logs(tmp_path, monkeypatch) -> LLMSummarizer:
+    """Return a summarizer with non-empty logs and a fake LLM."""
+    fs_log = tmp_path / "fs.json"
+    tmux_log = tmp_path / "tmux.json"
+    fs_log.write_text('{"timestamp": "2025-09-18T10:00:00"}\n')
+    tmux_log.write_text('{"timestamp": "2025-09-18T11:00:00"}\n')
+    monkeypatch.setattr("lib.llm_summarizer.summarize", lambda *_: "# Summary")
+
+    return LLMSummarizer(
+        tmux_log_path=str(tmux_log),
+        fs_log_path=str(fs_log),
+        output_dir=str(tmp_path / "summaries"),
+        run_hour=time_of_day(0),
+    )
+
+
+def test_generate_summary(tmp_path, summarizer_logs):
+    """Test `generate_summary` writes the report, `.last_run` and empties logs."""
+    generate_summary(summarizer_logs, StopAfterEvent(1))
+
+    today = date.today()
+    output_dir = tmp_path / "summaries"
+    assert (output_dir / f"{today:%Y-%m-%d}.md").read_text() == "# Summary"
+    assert (output_dir / LAST_RUN_FILE).read_text() == f"{today:%Y-%m-%d}"
+    assert summarizer_logs.last_run_day == today
+    assert (tmp_path / "fs.json").read_text() == ""
+    assert (tmp_path / "tmux.json").read_text() == ""
+
+    # A restarted summarizer does not generate the report of the day again
+    cfg = default_config()
+    cfg["summarizer"]["output_dir"] = str(output_dir)
+    write_config(cfg, str(tmp_path / "config"))
+    restored = LLMSummarizer()
+    update_from_config(restored, str(tmp_path / "config"))
+    assert restored.last_run_day == today
+
+
+def test_generate_summary_manual(tmp_path, summarizer_logs):
+    """Test a manual `generate_summary` does not skip the scheduled one."""
+    output_dir = tmp_path / "summaries"
+    report = output_dir / f"{date.today():%Y-%m-%d}.md"
+
+    generate_summary(summarizer_logs, Event(), wait_to_summarize=False)
+    assert report.read_text() == "# Summary"
+    assert not (output_dir / LAST_RUN_FILE).exists()
+    assert summarizer_logs.last_run_day == LLMSummarizer().last_run_day
+
+    report.unlink()
+    generate_summary(summarizer_logs, StopAfterEvent(1))
+    assert report.read_text() == "# Summary"
+
+
+def test_generate_summary_wait(tmp_path):
+    """Test `generate_summary` sleeps until the run hour unless `timeout` is given."""
+    run_hour = (datetime.now() + timedelta(hours=12)).time()
+    summarizer = LLMSummarizer(
+        output_dir=str(tmp_path), run_hour=run_hour, last_run_day=date.today()
+    )
+
+    stop_event = StopAfterEvent(1)
+    generate_summary(summarizer, stop_event)
+    assert len(stop_event.waits) == 1
+    assert 11 * 3600 < stop_event.waits[0] <= 13 * 3600
+
+    stop_event = StopAfterEvent(2)
+    generate_summary(summarizer, stop_event, timeout=60)
+    assert stop_event.waits == [60, 60]
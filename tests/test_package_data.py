@@ -1,15 +1,16 @@
 """Test package-data directories."""
 
+from importlib.resources import files
+
+PROMPTS_DIR = files("yves.prompts")
+CHECK_DIR = files("yves.check")
+
 
 def test_prompts_dir():
     """Test if `yves.prompts` directory exist."""
-    from importlib.resources import files
-
-    assert files("yves.prompts").is_dir()
+    assert PROMPTS_DIR.is_dir()
 
 
 def test_check_dir():
     """Test if `yves.check` directory exist."""
-    from importlib.resources import files
-
-    assert files("yves.check").is_dir()
+    assert CHECK_DIR.is_dir()
@@ -1,10 +1,133 @@
 """Test lib/tmux.py."""
 
+from subprocess import CompletedProcess
 
-def test_is_valid_command():
+import pytest
+
+from lib.tmux import (
+    get_command_from_content,
+    get_tmux_panes_content,
+    is_valid_command,
+)
+
+# Content of each pane for each `-S` value given to `capture-pane`, "" without `-S`
+PANES = {
+    "0:1.1": {"-50": "❯ make\nok\n❯\n", "-1000": "❯ make\nok\n❯\n"},
+    "0:1.2": {"-50": "a\nlong\noutput\n❯\n", "-1000": "❯ pytest\na\nlong\noutput\n❯\n"},
+    "0:1.3": {"-50": "", "-1000": "", "": "❯ make\nok\n❯\n"},
+}
+
+
+@pytest.fixture
+def tmux_calls(monkeypatch) -> list[list[str]]:
+    """Replace `tmux` by `PANES` and record each call."""
+    calls = []
+
+    def run(cmd, **_):
+        calls.append(cmd)
+        stdout = ""
+        # Commands chained with `;` are run one after the other
+        subcommand = []
+        for arg in [*cmd[1:], ";"]:
+            if arg != ";":
+                subcommand.append(arg)
+                continue
+            if subcommand[0] == "capture-pane":
+                pane = subcommand[subcommand.index("-t") + 1]
+                if pane not in PANES:
+                    return CompletedProcess(cmd, 1, stdout, f"can't find pane: {pane}")
+                start = (
+                    subcommand[subcommand.index("-S") + 1] if "-S" in subcommand else ""
+                )
+                stdout += PANES[pane][start]
+            elif subcommand[0] == "display-message":
+                stdout += f"{subcommand[-1]}\n"
+            subcommand = []
+        return CompletedProcess(cmd, 0, stdout, "")
+
+    monkeypatch.setattr("lib.tmux.subprocess.run", run)
+    return calls
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        ("", False),
+        ("this Is a v3ry long Command so this IS IN VA LID", False),
+        ("this Is an acceptable Command hence we Should Keep it", True),
+    ],
+)
+def test_is_valid_command(command, expected):
     """Test `is_valid_command`."""
-    from lib.tmux import is_valid_command
+    assert is_valid_command(command) is expected
+
+
+@pytest.mark.parametrize(
+    ("pane_content", "expected"),
+    [
+        ("", ""),
+        ("$ make test\nok\n", ""),
+        ("user@host:~$ make test\nok\nuser@host:~$", "make test"),
+        ("➜ repo git:(main) ❯ make\nok\n❯", "make"),
+        ("❯ echo a » b\na » b\n❯", "b"),
+        ("❯ ls\nREADME.md\n❯ git status\nclean\n❯", "git status"),
+        ("❯ git status\nclean\n❯ ls\nREADME.md\n❯", "git status"),
+        (">>> import os\n>>>", "import os"),
+    ],
+)
+def test_get_command_from_content(pane_content, expected):
+    """Test `get_command_from_content` tries `$`, then each marker, then `>>>`."""
+    assert get_command_from_content(pane_content) == expected
+
+
+def test_get_tmux_panes_content(tmux_calls):
+    """Test `get_tmux_panes_content` captures all panes with a single `tmux` call."""
+    assert get_tmux_panes_content([]) == {}
+    assert tmux_calls == []
+
+    assert get_tmux_panes_content(["0:1.1", "0:1.2"], max_scrollback=50) == {
+        "0:1.1": PANES["0:1.1"]["-50"],
+        "0:1.2": PANES["0:1.2"]["-50"],
+    }
+    assert len(tmux_calls) == 1
+    batch = tmux_calls[0]
+    assert batch[0] == "tmux"
+    assert batch.count("capture-pane") == batch.count("display-message") == 2
+    # the same random separator delimits each capture
+    separators = [
+        batch[i + 2] for i, arg in enumerate(batch) if arg == "display-message"
+    ]
+    assert separators[0] == separators[1]
+
+
+def test_get_tmux_panes_content_scrollback(tmux_calls):
+    """Test `get_tmux_panes_content` captures more history when the last command is missing."""
+    assert get_tmux_panes_content(["0:1.1", "0:1.2"]) == {
+        "0:1.1": PANES["0:1.1"]["-50"],
+        "0:1.2": PANES["0:1.2"]["-1000"],
+    }
+    assert len(tmux_calls) == 2
+    assert tmux_calls[1] == ["tmux", "capture-pane", "-t", "0:1.2", "-S", "-1000", "-p"]
+
+
+def test_get_tmux_panes_content_fallback(tmux_calls):
+    """Test `get_tmux_panes_content` captures each pane on its own if the batch fails."""
+    assert get_tmux_panes_content(["0:1.1", "0:1.2", "0:1.9"]) == {
+        "0:1.1": PANES["0:1.1"]["-50"],
+        "0:1.2": PANES["0:1.2"]["-1000"],
+        "0:1.9": "",
+    }
+    assert "display-message" in tmux_calls[0]
+    assert all("display-message" not in cmd for cmd in tmux_calls[1:])
+
 
-    assert not is_valid_command("")
-    assert not is_valid_command("this Is a v3ry long Command so this IS IN VA LID")
-    assert is_valid_command("this Is an acceptable Command hence we Should Keep it")
+def test_get_tmux_panes_content_empty(tmux_calls):
+    """Test `get_tmux_panes_content` captures an empty pane again without history."""
+    assert get_tmux_panes_content(["0:1.1", "0:1.3"]) == {
+        "0:1.1": PANES["0:1.1"]["-50"],
+        "0:1.3": PANES["0:1.3"][""],
+    }
+    assert tmux_calls[1:] == [
+        ["tmux", "capture-pane", "-t", "0:1.3", "-S", "-50", "-p"],
+        ["tmux", "capture-pane", "-t", "0:1.3", "-p"],
+    ]
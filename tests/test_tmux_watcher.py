@@ -1,32 +1,185 @@
 """Test lib/tmux_watcher.py."""
 
+from json import dumps, loads
+from queue import Queue
+from subprocess import CompletedProcess
+from threading import Event
 
-def test_update_from_config(tmp_path):
-    """Test `update_from_config` if it updates the current `TmuxWatcher` instance."""
-    from configparser import ConfigParser
-    from uuid import uuid4
+import pytest
+
+from lib.llm import merge_logs_by_timestamp
+from lib.tmux_watcher import (
+    TmuxWatcher,
+    check_for_completed_commands,
+    close_output_file,
+    update_from_config,
+    watch,
+    write_commands_from_queue,
+    write_commands_to_file,
+)
 
-    from lib.tmux_watcher import TmuxWatcher, update_from_config
+DEFAULT_WATCHER = TmuxWatcher()
 
-    abs_path = tmp_path / f"{uuid4().hex}"
-    default_watcher = TmuxWatcher()
+CONFIG = """\
+[tmux]
+enable = false
+panes = 0 , 1,my_session:my_window.1
+output_file = new_output_file.json
+capture_full_output = True
+"""
+
+
+def test_update_from_config(tmp_path):
+    """Test `update_from_config` if it updates the current `TmuxWatcher` instance."""
+    abs_path = tmp_path / "config"
     watcher = TmuxWatcher()
 
-    config = ConfigParser()
-    config["tmux"] = {
-        "enable": "false",
-        "panes": "0 , 1,my_session:my_window.1",
-        "output_file": "new_output_file.json",
-        "capture_full_output": "True",
-    }
-    with open(abs_path, "w") as f:
-        config.write(f)
+    abs_path.write_text(CONFIG)
 
     update_from_config(watcher, abs_path)
-    assert default_watcher != watcher
+    assert watcher != DEFAULT_WATCHER
     assert watcher == TmuxWatcher(
         False,
         ["0", "1", "my_session:my_window.1"],
         "new_output_file.json",
         True,
     )
+
+
+def test_write_commands_to_file(tmp_path):
+    """Test `write_commands_to_file` if it appends one JSON event per line."""
+    output_file = tmp_path / "tmux" / "changes.json"
+    watcher = TmuxWatcher(output_file=str(output_file))
+    completed_command = {
+        "pane": "0:1.2",
+        "command": "make test",
+        "output": "❯ make test\nAll tests passed\n",
+        "timestamp": 1758134923,
+    }
+
+    write_commands_to_file(watcher, [])
+    assert not output_file.exists()
+
+    write_commands_to_file(watcher, [completed_command])
+    write_commands_to_file(watcher, [completed_command, completed_command])
+
+    # events are flushed after each batch
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    close_output_file(watcher)
+    assert watcher.output_stream is None
+    assert len(lines) == 3
+    assert loads(lines[0]) == {
+        "event_type": "command_completed",
+        "timestamp": 1758134923,
+        "pane": "0:1.2",
+        "command": "make test",
+        "output": "❯ make test\nAll tests passed\n",
+    }
+
+
+def test_write_commands_to_file_legacy_log(tmp_path):
+    """Test `write_commands_to_file` if it keeps the events of a JSON array log."""
+    output_file = tmp_path / "tmux_changes.json"
+    old_event = {
+        "event_type": "command_completed",
+        "timestamp": 1758134000,
+        "pane": "0:1.2",
+        "command": "make",
+        "output": "❯ make\nBuilt\n",
+    }
+    output_file.write_text(dumps([old_event], indent=2), encoding="utf-8")
+
+    watcher = TmuxWatcher(output_file=str(output_file))
+    completed_command = {
+        "pane": "0:1.2",
+        "command": "make test",
+        "output": "❯ make test\nAll tests passed\n",
+        "timestamp": 1758134923,
+    }
+    write_commands_to_file(watcher, [completed_command])
+    close_output_file(watcher)
+
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    assert [loads(line)["command"] for line in lines] == ["make", "make test"]
+
+    merged = loads(merge_logs_by_timestamp(str(output_file), str(tmp_path / "fs.json")))
+    assert [event["command"] for event in merged] == ["make", "make test"]
+
+
+class StopAfterEvent(Event):
+    """Event recording each wait and set after `n_waits` waits."""
+
+    def __init__(self, n_waits: int):
+        super().__init__()
+        self.n_waits = n_waits
+        self.waits = []
+
+    def wait(self, timeout=None):
+        """Record `timeout` instead of waiting."""
+        self.waits.append(timeout)
+        if len(self.waits) == self.n_waits:
+            self.set()
+        return self.is_set()
+
+
+@pytest.mark.parametrize(
+    ("contents", "timeout", "max_timeout", "expected_waits"),
+    [
+        (["a", "a", "a", "a", "a", "a"], 1, 8, [1, 1, 2, 4, 8, 8]),
+        (["a", "a", "a", "b", "b"], 1, 8, [1, 1, 2, 1, 1]),
+        (["a", "b", "c", "c", "c"], 1, 8, [1, 1, 1, 1, 2]),
+        (["a", "a", "a"], 5, 2, [5, 5, 5]),
+    ],
+)
+def test_watch_backoff(
+    tmp_path, monkeypatch, contents, timeout, max_timeout, expected_waits
+):
+    """Test `watch` backs off while panes are idle and resets when a pane changes."""
+    pane_contents = iter(contents)
+
+    def run(cmd, **_):
+        # `display-message -p <separator>` ends the batched capture
+        content = f"step {next(pane_contents)}\n"
+        return CompletedProcess(cmd, 0, f"{content}{cmd[-1]}\n", "")
+
+    monkeypatch.setattr("lib.tmux.subprocess.run", run)
+    watcher = TmuxWatcher(panes=["0:1.2"], output_file=str(tmp_path / "tmux.json"))
+    stop_event = StopAfterEvent(len(expected_waits))
+
+    watch(watcher, stop_event, timeout, max_timeout)
+    assert stop_event.waits == expected_waits
+
+
+def test_check_for_completed_commands(monkeypatch):
+    """Test `check_for_completed_commands` only parses panes whose content changed."""
+    panes_content = {"0:1.2": "❯ make\nok\n❯"}
+    monkeypatch.setattr(
+        "lib.tmux_watcher.get_tmux_panes_content", lambda *_, **__: panes_content
+    )
+    watcher = TmuxWatcher(panes=["0:1.2"])
+
+    completed_commands = check_for_completed_commands(watcher)
+    assert [cmd["command"] for cmd in completed_commands] == ["make"]
+
+    # the same content is skipped even if its command would be reported again
+    watcher.pane_states["0:1.2"]["last_command"] = ""
+    assert check_for_completed_commands(watcher) == []
+
+    panes_content["0:1.2"] = "❯ make\nok\n❯ pytest\npassed\n❯"
+    completed_commands = check_for_completed_commands(watcher)
+    assert [cmd["command"] for cmd in completed_commands] == ["pytest"]
+
+
+def test_write_commands_from_queue(monkeypatch):
+    """Test `write_commands_from_queue` merges waiting batches and stops on `None`."""
+    written = []
+    monkeypatch.setattr(
+        "lib.tmux_watcher.write_commands_to_file",
+        lambda _, commands: written.append(commands),
+    )
+    commands_queue = Queue()
+    for batch in ([{"command": "make"}], [{"command": "pytest"}], None):
+        commands_queue.put(batch)
+
+    write_commands_from_queue(TmuxWatcher(), commands_queue, Event())
+    assert written == [[{"command": "make"}, {"command": "pytest"}]]